@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""Measure `dsa` startup cost.
+
+Runs each target in a fresh interpreter with ``-X importtime`` and reports the median
+cumulative import time plus the slowest top-level imports, so regressions in CLI startup
+(e.g. a heavy dependency imported at module level again) show up immediately.
+
+    python scripts/bench_import_time.py
+    python scripts/bench_import_time.py --runs 20 --target docusign_agreements_downloader.service
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+HEAVY = ("httpx", "pydantic", "pydantic_settings", "jwt", "cryptography", "tenacity")
+
+
+def measure(target: str) -> tuple[int, dict[str, int], list[str]]:
+    code = f"import sys, {target}; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    slowest: dict[str, int] = {}
+    total = 0
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        cumulative, indent, module = int(m.group(2)), len(m.group(3)), m.group(4)
+        if indent <= 1:
+            total += cumulative
+        if indent <= 3:  # top-level imports and their direct children
+            slowest[module] = cumulative
+    loaded = [m for m in proc.stdout.strip().split(",") if m]
+    return total, slowest, loaded
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--target", action="append", help="module to import (repeatable)")
+    ap.add_argument("--runs", type=int, default=10)
+    ap.add_argument("--top", type=int, default=8)
+    args = ap.parse_args()
+
+    targets = args.target or ["docusign_agreements_downloader.cli", "docusign_agreements_downloader.service"]
+    for target in targets:
+        runs = [measure(target) for _ in range(args.runs)]
+        totals = [r[0] for r in runs]
+        _, slowest, loaded = runs[-1]
+        print(f"{target}: median {statistics.median(totals) / 1000:.1f} ms over {args.runs} runs")
+        print(f"  heavy modules loaded: {', '.join(loaded) or 'none'}")
+        for module, us in sorted(slowest.items(), key=lambda kv: kv[1], reverse=True)[: args.top]:
+            print(f"  {us / 1000:8.1f} ms  {module}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,14 +3,41 @@ from __future__ import annotations
 import json
 from pathlib import Path
 import sys
+from typing import TYPE_CHECKING, Any
 import typer
 
-from .config import Settings
-from .service import AgreementDownloadService
+from .daemon import DEFAULT_SOCKET_PATH
+
+# Heavy modules (httpx, pydantic, PyJWT/cryptography, tenacity) are imported inside the
+# commands that need them so that `dsa --help` and daemon-forwarded calls start fast.
+if TYPE_CHECKING:
+    from .config import Settings
 
 app = typer.Typer(no_args_is_help=True, add_completion=False)
 
 
+def _load_settings() -> "Settings":
+    from .config import Settings
+
+    try:
+        return Settings()
+    except Exception as e:
+        typer.echo(f"Configuration error: {e}", err=True)
+        raise typer.Exit(code=2)
+
+
+def _require_columnar(fmt: str | None) -> None:
+    """Exit with a usage error if columnar output is requested but pyarrow is not installed."""
+    import importlib.util
+
+    if fmt and importlib.util.find_spec("pyarrow") is None:
+        typer.echo(
+            f"Columnar output ({fmt}) needs pyarrow: pip install 'docusign-agreements-downloader[columnar]'",
+            err=True,
+        )
+        raise typer.Exit(code=2)
+
+
 @app.command()
 def download(
         from_date: str = typer.Option(..., help="ISO-8601 start (required). Example: 2026-01-01T00:00:00Z"),
@@ -18,32 +45,237 @@ def download(
         status: str = typer.Option("completed", help="Envelope status filter (e.g., completed, sent, voided)"),
         out: Path = typer.Option(Path("./out"), help="Output directory"),
         page_size: int = typer.Option(100, min=1, max=1000, help="Page size for listing envelopes"),
+        priority: str = typer.Option(
+            "listing", help="Download order: listing, newest, oldest, sender, smallest"
+        ),
+        sender: list[str] = typer.Option([], help="Sender email(s) to download first (with --priority sender)"),
+        max_in_memory: int = typer.Option(
+            10_000, min=2, help="Listing rows kept in RAM while prioritising; the rest spill to disk"
+        ),
+        daemon_socket: Path | None = typer.Option(
+            None, envvar="DSA_DAEMON_SOCKET", help="Forward the job to a running `dsa daemon` on this socket"
+        ),
+        with_: str | None = typer.Option(
+            None,
+            "--with",
+            help="Per-envelope extras, comma-separated: recipients,tabs,custom_fields,audit_events,certificate "
+            "(default: DS_ENRICH)",
+        ),
+        columnar: str | None = typer.Option(
+            None, help="Also write date-partitioned metadata tables: parquet or arrow (needs pyarrow)"
+        ),
 ) -> None:
     """Download DocuSign agreements (envelopes) + documents to filesystem."""
-    try:
-        settings = Settings()
-    except Exception as e:
-        typer.echo(f"Configuration error: {e}", err=True)
-        raise typer.Exit(code=2)
+    from .daemon import DaemonError, DaemonUnavailable, download_job, send_job
+    from .enrichment import parse_enrichments
+    from .scheduling import POLICY_NAMES
 
-    svc = AgreementDownloadService(settings)
-    result = svc.download(out_dir=out, from_date=from_date, to_date=to_date, status=status, page_size=page_size)
+    enrich = None
+    if with_ is not None:
+        try:
+            enrich = list(parse_enrichments(with_))
+        except ValueError as e:
+            typer.echo(f"--with: {e}", err=True)
+            raise typer.Exit(code=2)
+    if columnar is not None and columnar not in ("parquet", "arrow"):
+        typer.echo("--columnar must be parquet or arrow", err=True)
+        raise typer.Exit(code=2)
+    _require_columnar(columnar)
 
-    summary = {
-        "status": result.status,
-        "out_dir": str(result.out_dir),
-        "exported": len(result.exported),
-        "failures": len(result.failures),
-        "started_at": result.started_at.isoformat(),
-        "finished_at": result.finished_at.isoformat(),
+    args: dict[str, Any] = {
+        "out": str(out.resolve()),
+        "from_date": from_date,
+        "to_date": to_date,
+        "status": status,
+        "page_size": page_size,
+        "priority": priority,
+        "senders": sender,
+        "max_in_memory": max_in_memory,
+        "enrich": enrich,
+        "columnar": columnar,
     }
+    if priority not in POLICY_NAMES or (priority == "sender" and not sender):
+        typer.echo(f"--priority must be one of {', '.join(POLICY_NAMES)}; 'sender' needs --sender", err=True)
+        raise typer.Exit(code=2)
+    reply = None
+    if daemon_socket is not None:
+        try:
+            reply = send_job(daemon_socket, "download", args)
+        except DaemonUnavailable:
+            pass  # run locally
+        except DaemonError as e:
+            typer.echo(f"error: {e}", err=True)
+            raise typer.Exit(code=1)
+    if reply is None:
+        from .service import AgreementDownloadService
+
+        settings = _load_settings()
+        _require_columnar(columnar or settings.columnar_format)
+        reply = download_job(AgreementDownloadService(settings), **args)
+
+    summary = reply["summary"]
     typer.echo(json.dumps(summary, indent=2))
 
-    if result.failures:
+    if reply["failures"]:
         typer.echo("\nFailures:", err=True)
-        for f in result.failures[:50]:
+        for f in reply["failures"]:
             typer.echo(f"- {f}", err=True)
-        raise typer.Exit(code=1 if result.status != "ok" else 0)
+        failures_path = Path(summary["out_dir"]) / "failures.json"
+        typer.echo(f"\nFull list in {failures_path}; re-drive with `dsa retry-failures`", err=True)
+        raise typer.Exit(code=1 if summary["status"] != "ok" else 0)
+
+
+@app.command("retry-failures")
+def retry_failures(
+        out: Path = typer.Option(Path("./out"), help="Export directory containing failures.json"),
+        concurrency: int = typer.Option(4, min=1, max=64, help="Envelopes re-driven in parallel"),
+        max_attempts: int = typer.Option(5, min=1, help="Skip records that already failed this many times"),
+        rounds: int = typer.Option(3, min=1, help="Retry passes per failure class"),
+        only_class: list[str] = typer.Option(
+            [], help="Restrict to failure classes (transport, server_error, rate_limited, client_error, other)"
+        ),
+) -> None:
+    """Re-drive only the envelopes/documents recorded in failures.json."""
+    from .redrive import FailureRedriver
+    from .service import AgreementDownloadService
+
+    redriver = FailureRedriver(
+        AgreementDownloadService(_load_settings()),
+        out.resolve(),
+        concurrency=concurrency,
+        max_attempts=max_attempts,
+        rounds=rounds,
+    )
+    result = redriver.run(classes=set(only_class) or None)
+    summary = {
+        "attempted": result.attempted,
+        "resolved": result.resolved,
+        "skipped": result.skipped,
+        "by_class": result.by_class,
+        "still_failing": len(result.still_failing),
+    }
+    typer.echo(json.dumps(summary, indent=2))
+    for r in result.still_failing[:50]:
+        doc = f" document {r.document_id}" if r.document_id else ""
+        typer.echo(f"- {r.envelope_id}{doc} [{r.failure_class}, attempt {r.attempts}]: {r.message}", err=True)
+    if result.still_failing:
+        raise typer.Exit(code=1)
+
+
+@app.command("serve-connect")
+def serve_connect(
+        out: Path = typer.Option(Path("./out"), help="Output directory"),
+        host: str = typer.Option("127.0.0.1", help="Listen address for Connect webhooks"),
+        port: int = typer.Option(8080, min=0, max=65535, help="Listen port for Connect webhooks"),
+        queue_path: Path | None = typer.Option(None, help="SQLite queue file (default: <out>/connect-queue.sqlite3)"),
+        workers: int = typer.Option(4, min=1, max=64, help="Concurrent download workers"),
+        batch_size: int = typer.Option(20, min=1, max=100, help="Envelopes looked up per listing call"),
+        sweep_interval_s: float = typer.Option(900.0, min=0, help="Polling safety-net interval (0 disables)"),
+        insecure_no_hmac: bool = typer.Option(
+            False, "--insecure-no-hmac", help="Accept unsigned events when DS_CONNECT_HMAC_KEY is not set"
+        ),
+) -> None:
+    """Receive DocuSign Connect events and export completed envelopes as they arrive."""
+    from .connect import ConnectQueue, ConnectWorkerPool, make_connect_server
+    from .service import AgreementDownloadService
+
+    settings = _load_settings()
+    if not settings.connect_hmac_key:
+        if not insecure_no_hmac:
+            typer.echo("DS_CONNECT_HMAC_KEY is required (or pass --insecure-no-hmac)", err=True)
+            raise typer.Exit(code=2)
+        typer.echo("Warning: --insecure-no-hmac; webhook signatures are not verified", err=True)
+
+    out = out.resolve()
+    queue = ConnectQueue(queue_path or out / "connect-queue.sqlite3")
+    pool = ConnectWorkerPool(
+        AgreementDownloadService(settings),
+        queue,
+        out,
+        workers=workers,
+        batch_size=batch_size,
+        sweep_interval_s=sweep_interval_s,
+    )
+    server = make_connect_server(
+        host, port, queue, settings.connect_hmac_key, insecure_no_hmac=insecure_no_hmac
+    )
+    pool.start()
+    typer.echo(f"Listening for DocuSign Connect on http://{host}:{server.server_address[1]}", err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.stop(timeout=30)
+        queue.close()
+
+
+@app.command()
+def verify(
+        out: Path = typer.Option(Path("./out"), help="Export directory to check"),
+        workers: int = typer.Option(8, min=1, max=128, help="Parallel agreement checks"),
+        hashes: bool = typer.Option(True, "--hashes/--no-hashes", help="Compare SHA-256 (slower) or sizes only"),
+        repair: bool = typer.Option(False, "--repair", help="Re-fetch bad or missing documents from DocuSign"),
+) -> None:
+    """Verify an export against its recorded manifests; optionally repair it."""
+    from .verify import ExportVerifier, repair as repair_export
+
+    verifier = ExportVerifier(out, workers=workers, check_hashes=hashes)
+
+    def progress(done: int, total: int, checked_bytes: int) -> None:
+        if done == total or done % 1000 == 0:
+            typer.echo(f"verified {done}/{total} agreements ({checked_bytes / 1e9:.2f} GB)", err=True)
+
+    report = verifier.verify(progress=progress)
+    summary = {
+        "out_dir": str(report.out_dir),
+        "agreements_checked": report.agreements_checked,
+        "files_checked": report.files_checked,
+        "bytes_checked": report.bytes_checked,
+        "issues": len(report.issues),
+    }
+    typer.echo(json.dumps(summary, indent=2))
+    for issue in report.issues[:50]:
+        doc = f" document {issue.document_id}" if issue.document_id else ""
+        typer.echo(f"- {issue.envelope_id}{doc}: {issue.kind} {issue.detail}".rstrip(), err=True)
+
+    if report.ok:
+        return
+    if not repair:
+        raise typer.Exit(code=1)
+
+    from .service import AgreementDownloadService
+
+    repaired = repair_export(AgreementDownloadService(_load_settings()), report)
+    still_failing = [f for r in repaired for f in r.failures]
+    typer.echo(f"Repaired {len(repaired)} agreement(s), {len(still_failing)} failure(s)", err=True)
+    for f in still_failing[:50]:
+        typer.echo(f"- {f}", err=True)
+    if still_failing:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def daemon(
+        socket_path: Path = typer.Option(DEFAULT_SOCKET_PATH, "--socket", help="Unix socket to listen on"),
+) -> None:
+    """Keep auth, account context and connections warm; serve jobs from thin `dsa` calls."""
+    from .daemon import make_daemon_server
+    from .service import AgreementDownloadService
+
+    svc = AgreementDownloadService(_load_settings())
+    svc.keep_warm()
+    server = make_daemon_server(socket_path, svc)
+    typer.echo(f"dsa daemon listening on {socket_path.expanduser()}", err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        socket_path.expanduser().unlink(missing_ok=True)
+        svc.close()
 
 
 def main() -> None:
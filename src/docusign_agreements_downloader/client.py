@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Callable, Optional, Sequence
 
 import httpx
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
 
 
 class ApiError(RuntimeError):
-    pass
+    def __init__(self, message: str, status_code: Optional[int] = None, endpoint: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.endpoint = endpoint
 
 
 class TransientApiError(ApiError):
@@ -28,10 +31,24 @@ class ApiContext:
 class DocuSignClient:
     """Thin DocuSign eSignature REST client with retries for transient failures."""
 
-    def __init__(self, http: httpx.Client, ctx: ApiContext, access_token: str):
+    def __init__(
+        self,
+        http: httpx.Client,
+        ctx: ApiContext,
+        access_token: str,
+        acquire_request: Optional[Callable[[], None]] = None,
+    ):
         self._http = http
         self._ctx = ctx
         self._access_token = access_token
+        # called before every request (and every retry) so all callers share one rate budget
+        self._acquire_request = acquire_request or (lambda: None)
+
+    def _envelope_url(self, envelope_id: str, suffix: str) -> str:
+        return (
+            f"{self._ctx.base_uri.rstrip('/')}/restapi/v2.1/accounts/{self._ctx.account_id}"
+            f"/envelopes/{envelope_id}/{suffix}"
+        )
 
     def _headers(self) -> dict[str, str]:
         return {"Authorization": f"Bearer {self._access_token}", "Accept": "application/json"}
@@ -39,10 +56,11 @@ class DocuSignClient:
     def _raise_for_status(self, resp: httpx.Response) -> None:
         if resp.status_code < 400:
             return
+        endpoint = f"{resp.request.method} {resp.request.url.path}"
         msg = f"{resp.request.method} {resp.request.url} -> {resp.status_code}: {resp.text}"
         if _is_transient_status(resp.status_code):
-            raise TransientApiError(msg)
-        raise ApiError(msg)
+            raise TransientApiError(msg, status_code=resp.status_code, endpoint=endpoint)
+        raise ApiError(msg, status_code=resp.status_code, endpoint=endpoint)
 
     @retry(
         retry=retry_if_exception_type((httpx.TransportError, TransientApiError)),
@@ -52,22 +70,38 @@ class DocuSignClient:
     )
     def list_envelopes(
         self,
-        from_date: str,
+        from_date: Optional[str],
         to_date: Optional[str],
         status: str,
         start_position: int = 0,
         page_size: int = 100,
+        include: Sequence[str] = (),
+        envelope_ids: Sequence[str] = (),
     ) -> dict[str, Any]:
-        """List envelopes (listStatusChanges) using from_date + optional to_date."""
+        """List envelopes (listStatusChanges) using from_date + optional to_date.
+
+        ``include`` asks DocuSign to inline per-envelope data (e.g. ``documents``,
+        ``recipients``, ``custom_fields``) so callers can skip one request per envelope.
+        ``envelope_ids`` switches to a batched lookup of specific envelopes; DocuSign
+        ignores the date window in that case.
+        """
         url = f"{self._ctx.base_uri.rstrip('/')}/restapi/v2.1/accounts/{self._ctx.account_id}/envelopes"
         params: dict[str, str] = {
-            "from_date": from_date,
-            "status": status,
             "start_position": str(start_position),
             "count": str(page_size),
         }
-        if to_date:
-            params["to_date"] = to_date
+        if envelope_ids:
+            params["envelope_ids"] = ",".join(envelope_ids)
+        else:
+            if not from_date:
+                raise ValueError("from_date is required unless envelope_ids is given")
+            params["from_date"] = from_date
+            params["status"] = status
+            if to_date:
+                params["to_date"] = to_date
+        if include:
+            params["include"] = ",".join(include)
+        self._acquire_request()
         resp = self._http.get(url, headers=self._headers(), params=params)
         self._raise_for_status(resp)
         return resp.json()
@@ -80,6 +114,7 @@ class DocuSignClient:
     )
     def list_envelope_documents(self, envelope_id: str) -> dict[str, Any]:
         url = f"{self._ctx.base_uri.rstrip('/')}/restapi/v2.1/accounts/{self._ctx.account_id}/envelopes/{envelope_id}/documents"
+        self._acquire_request()
         resp = self._http.get(url, headers=self._headers())
         self._raise_for_status(resp)
         return resp.json()
@@ -91,10 +126,53 @@ class DocuSignClient:
         reraise=True,
     )
     def get_document_stream(self, envelope_id: str, document_id: str) -> httpx.Response:
+        """Open a streamed document response; the caller must ``close()`` it."""
         url = (
             f"{self._ctx.base_uri.rstrip('/')}/restapi/v2.1/accounts/{self._ctx.account_id}"
             f"/envelopes/{envelope_id}/documents/{document_id}"
         )
-        resp = self._http.get(url, headers=self._headers(), follow_redirects=True)
+        req = self._http.build_request("GET", url, headers=self._headers())
+        self._acquire_request()
+        resp = self._http.send(req, stream=True, follow_redirects=True)
+        if resp.status_code >= 400:
+            resp.read()
+            resp.close()
         self._raise_for_status(resp)
         return resp
+
+    @retry(
+        retry=retry_if_exception_type((httpx.TransportError, TransientApiError)),
+        stop=stop_after_attempt(7),
+        wait=wait_exponential_jitter(initial=0.5, max=30.0),
+        reraise=True,
+    )
+    def list_envelope_recipients(self, envelope_id: str, include_tabs: bool = False) -> dict[str, Any]:
+        params = {"include_tabs": "true"} if include_tabs else {}
+        self._acquire_request()
+        resp = self._http.get(self._envelope_url(envelope_id, "recipients"), headers=self._headers(), params=params)
+        self._raise_for_status(resp)
+        return resp.json()
+
+    @retry(
+        retry=retry_if_exception_type((httpx.TransportError, TransientApiError)),
+        stop=stop_after_attempt(7),
+        wait=wait_exponential_jitter(initial=0.5, max=30.0),
+        reraise=True,
+    )
+    def list_envelope_custom_fields(self, envelope_id: str) -> dict[str, Any]:
+        self._acquire_request()
+        resp = self._http.get(self._envelope_url(envelope_id, "custom_fields"), headers=self._headers())
+        self._raise_for_status(resp)
+        return resp.json()
+
+    @retry(
+        retry=retry_if_exception_type((httpx.TransportError, TransientApiError)),
+        stop=stop_after_attempt(7),
+        wait=wait_exponential_jitter(initial=0.5, max=30.0),
+        reraise=True,
+    )
+    def list_envelope_audit_events(self, envelope_id: str) -> dict[str, Any]:
+        self._acquire_request()
+        resp = self._http.get(self._envelope_url(envelope_id, "audit_events"), headers=self._headers())
+        self._raise_for_status(resp)
+        return resp.json()
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import json
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from .models import ExportedAgreement
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+
+_EXTENSIONS = {"parquet": "parquet", "arrow": "arrow"}
+
+# Partition value for envelopes without a completed/created date (e.g. failed lookups).
+UNKNOWN_DATE = "unknown"
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow as pa  # type: ignore[import-untyped]
+    except ImportError as e:
+        raise ImportError(
+            "Columnar export needs pyarrow: pip install 'docusign-agreements-downloader[columnar]'"
+        ) from e
+    return pa
+
+
+def _schemas(pa: Any) -> dict[str, Any]:
+    ts = pa.timestamp("us", tz="UTC")
+    return {
+        "envelopes": pa.schema(
+            [
+                ("envelope_id", pa.string()),
+                ("status", pa.string()),
+                ("subject", pa.string()),
+                ("sender_email", pa.string()),
+                ("sender_name", pa.string()),
+                ("created_date_time", ts),
+                ("completed_date_time", ts),
+                ("document_count", pa.int32()),
+                ("downloaded_count", pa.int32()),
+                ("failure_count", pa.int32()),
+                ("agreement_dir", pa.string()),
+                # enrichment, as JSON text (null when not requested)
+                ("recipients", pa.string()),
+                ("tabs", pa.string()),
+                ("custom_fields", pa.string()),
+                ("audit_events", pa.string()),
+                ("run_id", pa.string()),
+                ("exported_at", ts),
+            ]
+        ),
+        "documents": pa.schema(
+            [
+                ("envelope_id", pa.string()),
+                ("document_id", pa.string()),
+                ("name", pa.string()),
+                ("type", pa.string()),
+                ("estimated_size", pa.int64()),
+                ("downloaded", pa.bool_()),
+                ("path", pa.string()),
+                ("size", pa.int64()),
+                ("sha256", pa.string()),
+                ("run_id", pa.string()),
+                ("exported_at", ts),
+            ]
+        ),
+        "failures": pa.schema(
+            [
+                ("envelope_id", pa.string()),
+                ("document_id", pa.string()),
+                ("component", pa.string()),
+                ("endpoint", pa.string()),
+                ("http_status", pa.int32()),
+                ("exception_class", pa.string()),
+                ("failure_class", pa.string()),
+                ("message", pa.string()),
+                ("failed_at", ts),
+                ("run_id", pa.string()),
+                ("exported_at", ts),
+            ]
+        ),
+    }
+
+
+def partition_date(e: ExportedAgreement) -> str:
+    env = e.agreement.envelope
+    dt = env.completed_date_time or env.created_date_time
+    if dt is None:
+        return UNKNOWN_DATE
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.date().isoformat()
+
+
+def _json(v: Any) -> Optional[str]:
+    return None if v is None else json.dumps(v, default=str)
+
+
+class ColumnarExporter:
+    """Appends export metadata to date-partitioned Parquet or Arrow IPC tables.
+
+    Layout (hive-style, readable by pyarrow.dataset, DuckDB, Polars, Spark)::
+
+        <out_dir>/columnar/<table>/date=YYYY-MM-DD/part-<run_id>-<n>.<ext>
+
+    with tables ``envelopes``, ``documents`` and ``failures``. Rows are buffered per
+    (table, date) and written as one row group once ``rows_per_group`` accumulate. Memory
+    stays bounded: past ``max_buffered_rows`` the largest buffer is flushed early, and at
+    most ``max_open_files`` partition files are open (the least recently used is finished
+    and a new part started on its next write). Files are written under a hidden name and
+    renamed on completion, so readers never see a partial file. Every run adds new parts;
+    ``run_id``/``exported_at`` tell re-exports of the same envelope apart.
+    """
+
+    def __init__(
+        self,
+        out_dir: Path,
+        format: str = "parquet",
+        rows_per_group: int = 50_000,
+        max_buffered_rows: int = 200_000,
+        max_open_files: int = 32,
+    ):
+        if format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format {format!r}; expected one of {', '.join(COLUMNAR_FORMATS)}")
+        self._pa = _require_pyarrow()
+        self._schemas = _schemas(self._pa)
+        self.root = out_dir / "columnar"
+        self.format = format
+        self.rows_per_group = max(1, rows_per_group)
+        self.max_buffered_rows = max(self.rows_per_group, max_buffered_rows)
+        self.max_open_files = max(1, max_open_files)
+        self.run_id = f"{datetime.now(tz=timezone.utc):%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:8]}"
+        self._exported_at = datetime.now(tz=timezone.utc)
+        self._buffers: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self._buffered = 0
+        # (table, date) -> (writer, in-progress path, final path), least recently used first
+        self._writers: OrderedDict[tuple[str, str], tuple[Any, Path, Path]] = OrderedDict()
+        self._parts = 0
+        self.files: list[Path] = []
+
+    def add(self, e: ExportedAgreement) -> None:
+        """Buffer the rows for one exported envelope."""
+        date = partition_date(e)
+        env = e.agreement.envelope
+        a = e.agreement
+        common = {"run_id": self.run_id, "exported_at": self._exported_at}
+        self._append(
+            "envelopes",
+            date,
+            {
+                "envelope_id": env.envelope_id,
+                "status": env.status,
+                "subject": env.subject,
+                "sender_email": env.sender_email,
+                "sender_name": env.sender_name,
+                "created_date_time": env.created_date_time,
+                "completed_date_time": env.completed_date_time,
+                "document_count": len(a.documents),
+                "downloaded_count": len(e.manifest),
+                "failure_count": len(e.failure_records),
+                "agreement_dir": str(e.agreement_dir),
+                "recipients": _json(a.recipients),
+                "tabs": _json(a.tabs),
+                "custom_fields": _json(a.custom_fields),
+                "audit_events": _json(a.audit_events),
+                **common,
+            },
+        )
+        written = {m.document_id: m for m in e.manifest}
+        for d in a.documents:
+            m = written.get(d.document_id)
+            self._append(
+                "documents",
+                date,
+                {
+                    "envelope_id": env.envelope_id,
+                    "document_id": d.document_id,
+                    "name": d.name,
+                    "type": d.type,
+                    "estimated_size": d.estimated_size,
+                    "downloaded": m is not None,
+                    "path": str(m.path) if m else None,
+                    "size": m.size if m else None,
+                    "sha256": m.sha256 if m else None,
+                    **common,
+                },
+            )
+        for r in e.failure_records:
+            self._append(
+                "failures",
+                date,
+                {
+                    "envelope_id": r.envelope_id,
+                    "document_id": r.document_id,
+                    "component": r.component,
+                    "endpoint": r.endpoint,
+                    "http_status": r.http_status,
+                    "exception_class": r.exception_class,
+                    "failure_class": r.failure_class,
+                    "message": r.message,
+                    "failed_at": r.failed_at,
+                    **common,
+                },
+            )
+
+    def _append(self, table: str, date: str, row: dict[str, Any]) -> None:
+        key = (table, date)
+        buf = self._buffers.setdefault(key, [])
+        buf.append(row)
+        self._buffered += 1
+        if len(buf) >= self.rows_per_group:
+            self._flush(key)
+        elif self._buffered > self.max_buffered_rows:
+            self._flush(max(self._buffers, key=lambda k: len(self._buffers[k])))
+
+    def _writer(self, key: tuple[str, str]) -> Any:
+        entry = self._writers.get(key)
+        if entry is not None:
+            self._writers.move_to_end(key)
+            return entry[0]
+        if len(self._writers) >= self.max_open_files:
+            self._finish(next(iter(self._writers)))
+        table, date = key
+        part_dir = self.root / table / f"date={date}"
+        part_dir.mkdir(parents=True, exist_ok=True)
+        name = f"part-{self.run_id}-{self._parts:05d}.{_EXTENSIONS[self.format]}"
+        self._parts += 1
+        final = part_dir / name
+        tmp = part_dir / f".{name}.inprogress"
+        schema = self._schemas[table]
+        if self.format == "parquet":
+            import pyarrow.parquet as pq  # type: ignore[import-untyped]
+
+            writer = pq.ParquetWriter(str(tmp), schema, compression="zstd")
+        else:
+            writer = self._pa.ipc.new_file(str(tmp), schema)
+        self._writers[key] = (writer, tmp, final)
+        return writer
+
+    def _flush(self, key: tuple[str, str]) -> None:
+        rows = self._buffers.pop(key, None)
+        if not rows:
+            return
+        self._buffered -= len(rows)
+        batch = self._pa.Table.from_pylist(rows, schema=self._schemas[key[0]])
+        self._writer(key).write_table(batch)
+
+    def _finish(self, key: tuple[str, str]) -> None:
+        writer, tmp, final = self._writers.pop(key)
+        writer.close()
+        os.replace(tmp, final)
+        self.files.append(final)
+
+    def close(self) -> list[Path]:
+        """Flush every buffer, finish all files and return the paths written this run."""
+        for key in list(self._buffers):
+            self._flush(key)
+        for key in list(self._writers):
+            self._finish(key)
+        return self.files
+
+    def __enter__(self) -> "ColumnarExporter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
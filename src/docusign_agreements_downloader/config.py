@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 from pathlib import Path
-from pydantic import AnyHttpUrl, Field
+from typing import Literal, Optional
+from pydantic import AnyHttpUrl, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .enrichment import parse_enrichments
+
 
 class Settings(BaseSettings):
     """Runtime configuration loaded from environment variables.
@@ -22,8 +25,42 @@ class Settings(BaseSettings):
     private_key_pem_path: Path = Field(..., description="Path to RSA private key PEM for JWT signing")
     scopes: str = Field("signature impersonation", description="OAuth scopes (space-separated)")
 
+    connect_hmac_key: Optional[str] = Field(
+        None, description="DocuSign Connect HMAC secret used to verify webhook payloads"
+    )
+
     http_timeout_s: float = Field(30.0, ge=1.0, le=300.0, description="HTTP timeout (seconds)")
 
+    download_workers: int = Field(1, ge=1, le=64, description="Concurrent envelope/document downloads")
+    bandwidth_bps: Optional[float] = Field(None, gt=0, description="Global download cap (bytes/s)")
+    per_worker_bandwidth_bps: Optional[float] = Field(None, gt=0, description="Per-worker download cap (bytes/s)")
+    disk_write_bps: Optional[float] = Field(None, gt=0, description="Disk write cap (bytes/s)")
+    max_inflight_bytes: Optional[int] = Field(None, gt=0, description="Max bytes of documents downloading at once")
+    unknown_document_bytes: int = Field(
+        10 * 1024 * 1024, ge=0, description="In-flight bytes reserved for a document of unknown size"
+    )
+    large_document_bytes: int = Field(
+        10 * 1024 * 1024, ge=1, description="Documents at least this size run on the large-document lane"
+    )
+    large_document_slots: int = Field(1, ge=1, description="Workers reserved for large documents")
+    api_requests_per_s: Optional[float] = Field(
+        None, gt=0, description="Shared DocuSign API request budget (requests/s) for all calls"
+    )
+
+    enrich: str = Field(
+        "", description="Comma-separated extras per envelope: recipients,tabs,audit_events,custom_fields,certificate"
+    )
+    enrichment_workers: int = Field(4, ge=1, le=64, description="Concurrent enrichment requests")
+
+    columnar_format: Optional[Literal["parquet", "arrow"]] = Field(
+        None, description="Also write date-partitioned Parquet/Arrow metadata tables (needs pyarrow)"
+    )
+
+    @field_validator("enrich")
+    @classmethod
+    def _check_enrich(cls, v: str) -> str:
+        return ",".join(parse_enrichments(v))
+
     def private_key_pem_bytes(self) -> bytes:
         p = self.private_key_pem_path.expanduser().resolve()
         if not p.exists():
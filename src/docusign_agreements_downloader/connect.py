@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+
+from .exporter import FilesystemExporter
+from .models import FailureRecord
+from .service import AgreementDownloadService, _failure_record, _resolved_keys
+
+log = logging.getLogger(__name__)
+
+_SIGNATURE_HEADER_PREFIX = "x-docusign-signature-"
+
+# Connect JSON events are a few KB; anything near this is not a Connect event.
+MAX_BODY_BYTES = 1024 * 1024
+
+
+def compute_hmac_signature(secret: str, body: bytes) -> str:
+    """Base64 HMAC-SHA256 of the raw request body, as DocuSign Connect sends it."""
+    digest = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def verify_hmac(secret: str, body: bytes, signatures: list[str]) -> bool:
+    """True if any ``X-DocuSign-Signature-N`` header matches ``secret``."""
+    expected = compute_hmac_signature(secret, body)
+    return any(hmac.compare_digest(expected, s.strip()) for s in signatures)
+
+
+def completed_envelope_id(payload: dict[str, Any]) -> Optional[str]:
+    """Envelope id of a Connect JSON event if it reports a completed envelope, else None."""
+    data = payload.get("data") or {}
+    env_id = data.get("envelopeId") or payload.get("envelopeId")
+    if not env_id:
+        return None
+    event = str(payload.get("event") or "").lower()
+    summary_status = str((data.get("envelopeSummary") or {}).get("status") or "").lower()
+    if event == "envelope-completed" or summary_status == "completed":
+        return str(env_id)
+    return None
+
+
+class ConnectQueue:
+    """Durable, de-duplicating envelope queue backed by SQLite.
+
+    Each envelope id appears once; repeated Connect deliveries for an envelope that is
+    already pending, in progress or done are ignored.
+    """
+
+    def __init__(self, path: Path, max_attempts: int = 5):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS envelopes ("
+            " envelope_id TEXT PRIMARY KEY,"
+            " state TEXT NOT NULL DEFAULT 'pending',"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " last_error TEXT,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def enqueue(self, envelope_id: str) -> bool:
+        """Queue ``envelope_id``; returns False if it was already known."""
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT OR IGNORE INTO envelopes (envelope_id, updated_at) VALUES (?, ?)",
+                (envelope_id, time.time()),
+            )
+            return cur.rowcount == 1
+
+    def claim(self, limit: int) -> list[str]:
+        """Atomically move up to ``limit`` pending envelopes to in_progress."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT envelope_id FROM envelopes WHERE state = 'pending' ORDER BY updated_at LIMIT ?",
+                (limit,),
+            ).fetchall()
+            ids = [r[0] for r in rows]
+            if ids:
+                self._db.executemany(
+                    "UPDATE envelopes SET state = 'in_progress', updated_at = ? WHERE envelope_id = ?",
+                    [(time.time(), i) for i in ids],
+                )
+            return ids
+
+    def mark_done(self, envelope_id: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE envelopes SET state = 'done', last_error = NULL, updated_at = ? WHERE envelope_id = ?",
+                (time.time(), envelope_id),
+            )
+
+    def mark_failed(self, envelope_id: str, error: str) -> None:
+        """Return the envelope to pending, or park it as failed after ``max_attempts``."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE envelopes SET attempts = attempts + 1, last_error = ?, updated_at = ?,"
+                " state = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END"
+                " WHERE envelope_id = ?",
+                (error, time.time(), self.max_attempts, envelope_id),
+            )
+
+    def requeue_in_progress(self) -> int:
+        """Recover envelopes claimed by a process that died before finishing them."""
+        with self._lock:
+            cur = self._db.execute("UPDATE envelopes SET state = 'pending' WHERE state = 'in_progress'")
+            return cur.rowcount
+
+    def last_sweep(self) -> Optional[datetime]:
+        """Start time of the last successful polling sweep, if any."""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'last_sweep'").fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def set_last_sweep(self, when: datetime) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO meta (key, value) VALUES ('last_sweep', ?)"
+                " ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (when.astimezone(timezone.utc).isoformat(),),
+            )
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM envelopes GROUP BY state").fetchall()
+        return {state: n for state, n in rows}
+
+
+def make_connect_server(
+    host: str,
+    port: int,
+    queue: ConnectQueue,
+    hmac_key: Optional[str],
+    insecure_no_hmac: bool = False,
+    max_body_bytes: int = MAX_BODY_BYTES,
+) -> ThreadingHTTPServer:
+    """HTTP server that accepts Connect JSON events and enqueues completed envelopes.
+
+    Events must carry a valid HMAC signature; ``insecure_no_hmac`` must be passed
+    explicitly to accept unsigned events when no ``hmac_key`` is configured.
+    """
+    if not hmac_key and not insecure_no_hmac:
+        raise ValueError("Connect HMAC key is required (set DS_CONNECT_HMAC_KEY)")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802 (http.server API)
+            try:
+                length = int(self.headers.get("Content-Length") or "")
+            except ValueError:
+                self._reply(411, {"error": "a valid Content-Length is required"})
+                return
+            if length < 0:
+                self._reply(400, {"error": "invalid Content-Length"})
+                return
+            if length > max_body_bytes:
+                self.close_connection = True  # do not read the oversized body
+                self._reply(413, {"error": f"body exceeds {max_body_bytes} bytes"})
+                return
+            body = self.rfile.read(length)
+            if hmac_key:
+                signatures = [v for k, v in self.headers.items() if k.lower().startswith(_SIGNATURE_HEADER_PREFIX)]
+                if not verify_hmac(hmac_key, body, signatures):
+                    self._reply(401, {"error": "invalid signature"})
+                    return
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                self._reply(400, {"error": "invalid JSON"})
+                return
+            env_id = completed_envelope_id(payload) if isinstance(payload, dict) else None
+            queued = queue.enqueue(env_id) if env_id else False
+            # Always 200 for well-formed events; non-2xx makes DocuSign redeliver.
+            self._reply(200, {"envelope_id": env_id, "queued": queued})
+
+        def _reply(self, code: int, body: dict[str, Any]) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            log.debug("connect: " + format, *args)
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+class ConnectWorkerPool:
+    """Drains a :class:`ConnectQueue` through the regular document download path.
+
+    Envelopes are claimed in batches and looked up with one ``envelope_ids`` listing
+    call per batch. A polling sweep at startup and then every ``sweep_interval_s`` enqueues
+    anything Connect failed to deliver, starting from the last successful sweep.
+    """
+
+    def __init__(
+        self,
+        service: AgreementDownloadService,
+        queue: ConnectQueue,
+        out_dir: Path,
+        workers: int = 4,
+        batch_size: int = 20,
+        poll_interval_s: float = 2.0,
+        sweep_interval_s: float = 900.0,
+        sweep_status: str = "completed",
+        reauth_interval_s: float = 3000.0,
+    ):
+        self.service = service
+        self.queue = queue
+        self.exporter = FilesystemExporter(out_dir)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval_s = poll_interval_s
+        self.sweep_interval_s = sweep_interval_s
+        self.sweep_status = sweep_status
+        self.reauth_interval_s = reauth_interval_s
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def drain_once(self, api) -> int:
+        """Process one batch; returns the number of envelopes claimed.
+
+        Failures are also recorded in ``failures.json`` so ``dsa retry-failures`` sees them.
+        Only envelope-level failures return the envelope to the queue.
+        """
+        ids = self.queue.claim(self.batch_size)
+        if not ids:
+            return 0
+        try:
+            rows = {str(r.get("envelopeId")): r for r in self.service.lookup_envelopes(api, ids)}
+        except Exception as e:
+            for env_id in ids:
+                self.queue.mark_failed(env_id, f"lookup failed: {e}")
+            self.exporter.update_failures([_failure_record(e, env_id) for env_id in ids], resolved=set())
+            return len(ids)
+
+        exported = []
+        records: list[FailureRecord] = []
+        for env_id in ids:
+            row = rows.get(env_id)
+            if row is None:
+                self.queue.mark_failed(env_id, "envelope not returned by lookup")
+                records.append(_failure_record(LookupError(f"Envelope {env_id} not returned by lookup"), env_id))
+                continue
+            result = self.service.export_envelope(api, self.exporter, row)
+            exported.append(result)
+            records.extend(result.failure_records)
+            # document and enrichment failures are left to failures.json (`dsa retry-failures`);
+            # re-queueing would re-export every document of the envelope
+            if any(r.level == "envelope" for r in result.failure_records):
+                self.queue.mark_failed(env_id, "; ".join(result.failures))
+            else:
+                self.queue.mark_done(env_id)
+        if exported:
+            self.exporter.merge_index(exported)
+        self.exporter.update_failures(records, resolved=_resolved_keys(exported))
+        return len(ids)
+
+    def sweep(self, api, since: datetime) -> int:
+        """Enqueue envelopes that reached ``sweep_status`` since ``since``; returns new ids."""
+        added = 0
+        from_date = since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        for envelopes in self.service.iter_envelope_pages(api, from_date, None, self.sweep_status):
+            for env in envelopes:
+                env_id = env.get("envelopeId")
+                if env_id and self.queue.enqueue(str(env_id)):
+                    added += 1
+        return added
+
+    def sweep_since_last(self, api) -> int:
+        """Sweep from the queue's high-water mark and advance it once the sweep succeeds.
+
+        The first sweep ever looks back one ``sweep_interval_s``.
+        """
+        now = datetime.now(tz=timezone.utc)
+        since = self.queue.last_sweep() or now - timedelta(seconds=self.sweep_interval_s)
+        added = self.sweep(api, since)
+        self.queue.set_last_sweep(now)
+        return added
+
+    def _worker_loop(self) -> None:
+        with self.service._http_client() as http:
+            api, authed_at = None, 0.0
+            while not self._stop.is_set():
+                try:
+                    if api is None or time.monotonic() - authed_at > self.reauth_interval_s:
+                        api, authed_at = self.service._open_api(http), time.monotonic()
+                    if not self.drain_once(api):
+                        self._stop.wait(self.poll_interval_s)
+                except Exception:
+                    log.exception("connect worker error")
+                    api = None
+                    self._stop.wait(self.poll_interval_s)
+
+    def _sweep_loop(self) -> None:
+        # sweep once at startup so envelopes completed while the receiver was down are caught
+        while True:
+            try:
+                with self.service._http_client() as http:
+                    added = self.sweep_since_last(self.service._open_api(http))
+                log.info("connect sweep enqueued %d envelope(s)", added)
+            except Exception:
+                log.exception("connect sweep failed")
+            if self._stop.wait(self.sweep_interval_s):
+                return
+
+    def start(self) -> None:
+        self.queue.requeue_in_progress()
+        self._threads = [threading.Thread(target=self._worker_loop, daemon=True) for _ in range(self.workers)]
+        if self.sweep_interval_s > 0:
+            self._threads.append(threading.Thread(target=self._sweep_loop, daemon=True))
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout)
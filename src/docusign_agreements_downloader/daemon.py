@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+# Only the standard library at module level: the CLI imports this on every invocation
+# to decide whether to forward a job to a running daemon, so it must stay cheap.
+
+import json
+import logging
+import os
+import socket
+import socketserver
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from .service import AgreementDownloadService
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = Path("~/.dsa/daemon.sock")
+
+
+class DaemonError(RuntimeError):
+    pass
+
+
+class DaemonUnavailable(DaemonError):
+    """No daemon is listening on the socket; the caller should run the job itself."""
+
+
+def download_job(
+    service: "AgreementDownloadService",
+    out: str,
+    from_date: str,
+    to_date: Optional[str],
+    status: str,
+    page_size: int,
+    priority: str = "listing",
+    senders: Optional[list[str]] = None,
+    max_in_memory: int = 10_000,
+    enrich: Optional[list[str]] = None,
+    columnar: Optional[str] = None,
+) -> dict[str, Any]:
+    """Run a download and return the JSON-serialisable reply the CLI prints."""
+    from .scheduling import make_policy
+
+    result = service.download(
+        out_dir=Path(out),
+        from_date=from_date,
+        to_date=to_date,
+        status=status,
+        page_size=page_size,
+        priority=make_policy(priority, senders),
+        max_in_memory=max_in_memory,
+        enrich=enrich,
+        columnar=columnar,
+    )
+    return {
+        "summary": {
+            "status": result.status,
+            "out_dir": str(result.out_dir),
+            "exported": len(result.exported),
+            "failures": len(result.failures),
+            "started_at": result.started_at.isoformat(),
+            "finished_at": result.finished_at.isoformat(),
+        },
+        "failures": result.failures[:50],
+    }
+
+
+_JOBS = {"download": download_job}
+
+
+def send_job(socket_path: Path, command: str, args: dict[str, Any], timeout: Optional[float] = None) -> dict[str, Any]:
+    """Send one job to a running daemon and wait for its reply.
+
+    Raises :class:`DaemonUnavailable` if the job could not be handed to a daemon on
+    ``socket_path`` (nothing listening, no permission, connection dropped before the job
+    was sent), and :class:`DaemonError` if the daemon took the job but it failed.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(str(socket_path.expanduser()))
+            sock.sendall(json.dumps({"command": command, "args": args}).encode("utf-8") + b"\n")
+        except (FileNotFoundError, PermissionError, ConnectionError) as e:
+            raise DaemonUnavailable(f"no daemon on {socket_path}: {e}") from e
+        try:
+            with sock.makefile("rb") as f:
+                line = f.readline()
+        except ConnectionError as e:
+            raise DaemonError(f"daemon dropped the connection: {e}") from e
+    if not line:
+        raise DaemonError("daemon closed the connection without replying")
+    reply = json.loads(line)
+    if not reply.get("ok"):
+        raise DaemonError(reply.get("error") or "daemon job failed")
+    return reply["result"]
+
+
+def daemon_available(socket_path: Path) -> bool:
+    p = socket_path.expanduser()
+    if not p.exists():
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(p))
+        except OSError:
+            return False
+    return True
+
+
+def make_daemon_server(socket_path: Path, service: "AgreementDownloadService") -> socketserver.UnixStreamServer:
+    """Threaded Unix-socket server running jobs against one warm ``service``."""
+    p = socket_path.expanduser()
+    p.parent.mkdir(parents=True, exist_ok=True)
+    if p.exists():
+        if daemon_available(p):
+            raise DaemonError(f"a daemon is already listening on {p}")
+        p.unlink()  # stale socket from a previous run
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            line = self.rfile.readline()
+            if not line.strip():
+                return  # liveness probe (connect + close), not a job
+            try:
+                request = json.loads(line)
+                job = _JOBS.get(request.get("command"))
+                if job is None:
+                    raise DaemonError(f"unknown command: {request.get('command')!r}")
+                reply = {"ok": True, "result": job(service, **request.get("args", {}))}
+            except Exception as e:
+                log.exception("daemon job failed")
+                reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    server = Server(str(p), Handler)
+    os.chmod(p, 0o600)
+    return server
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+# Standard library only: the CLI validates `--with` before importing the service.
+
+from typing import Any, Iterable, Optional, Union
+
+ENRICHMENTS = ("recipients", "tabs", "custom_fields", "audit_events", "certificate")
+"""Optional per-envelope extras, in the order they are written to ``agreement.json``."""
+
+# Listing `include` values that inline an enrichment into each listing row.
+LISTING_INLINE = {"recipients": "recipients", "custom_fields": "custom_fields"}
+
+CERTIFICATE_DOCUMENT_ID = "certificate"
+
+
+def parse_enrichments(spec: Union[str, Iterable[str], None]) -> tuple[str, ...]:
+    """Normalise ``"recipients,tabs"`` (or a list of such strings) to known names, in order."""
+    if spec is None:
+        return ()
+    parts = [spec] if isinstance(spec, str) else list(spec)
+    names = {p.strip().lower() for part in parts for p in part.split(",") if p.strip()}
+    unknown = names.difference(ENRICHMENTS)
+    if unknown:
+        raise ValueError(
+            f"Unknown enrichment(s) {', '.join(sorted(unknown))}; expected any of {', '.join(ENRICHMENTS)}"
+        )
+    return tuple(n for n in ENRICHMENTS if n in names)
+
+
+def _recipient_groups(payload: dict[str, Any]) -> Iterable[list[dict[str, Any]]]:
+    # signers, carbonCopies, certifiedDeliveries, inPersonSigners, witnesses, ...
+    for value in payload.values():
+        if isinstance(value, list) and all(isinstance(r, dict) for r in value):
+            yield value
+
+
+def recipient_tabs(payload: dict[str, Any]) -> dict[str, Any]:
+    """``recipientId -> tabs`` from a recipients payload fetched with ``include_tabs``."""
+    tabs: dict[str, Any] = {}
+    for group in _recipient_groups(payload):
+        for r in group:
+            if r.get("tabs") and r.get("recipientId") is not None:
+                tabs[str(r["recipientId"])] = r["tabs"]
+    return tabs
+
+
+def without_tabs(payload: dict[str, Any]) -> dict[str, Any]:
+    """Copy of a recipients payload with each recipient's ``tabs`` removed."""
+    out = dict(payload)
+    for key, group in payload.items():
+        if isinstance(group, list) and all(isinstance(r, dict) for r in group):
+            out[key] = [{k: v for k, v in r.items() if k != "tabs"} for r in group]
+    return out
+
+
+def flatten_audit_events(payload: Optional[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Turn DocuSign's ``{"auditEvents": [{"eventFields": [{name, value}]}]}`` into plain dicts."""
+    events = (payload or {}).get("auditEvents") or []
+    return [
+        {str(f.get("name")): f.get("value") for f in ev.get("eventFields") or [] if f.get("name")}
+        for ev in events
+    ]
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import json
 import re
+import threading
 from pathlib import Path
+from typing import Optional
 
-from .models import Agreement, ExportedAgreement
+from .models import Agreement, ExportedAgreement, FailureRecord, FileManifest
 
 
 _SAFE = re.compile(r"[^a-zA-Z0-9._-]+")
@@ -22,6 +24,7 @@ class FilesystemExporter:
 
     def __init__(self, out_dir: Path):
         self.out_dir = out_dir.resolve()
+        self._index_lock = threading.Lock()
 
     def prepare_agreement_dirs(self, envelope_id: str) -> tuple[Path, Path, Path]:
         agreement_dir = self.out_dir / envelope_id
@@ -34,24 +37,111 @@ class FilesystemExporter:
     def write_agreement_json(self, agreement: Agreement, agreement_json_path: Path) -> None:
         agreement_json_path.write_text(agreement.model_dump_json(indent=2), encoding="utf-8")
 
+    def write_manifest(self, agreement_dir: Path, entries: list[FileManifest]) -> Path:
+        manifest_path = agreement_dir / "manifest.json"
+        rows = [json.loads(e.model_dump_json()) for e in entries]
+        tmp = manifest_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+        tmp.replace(manifest_path)
+        return manifest_path
+
+    def read_manifest(self, agreement_dir: Path) -> list[FileManifest]:
+        manifest_path = agreement_dir / "manifest.json"
+        if not manifest_path.exists():
+            return []
+        return [FileManifest.model_validate(r) for r in json.loads(manifest_path.read_text(encoding="utf-8"))]
+
+    def merge_manifest(self, agreement_dir: Path, entries: list[FileManifest]) -> Path:
+        """Replace manifest entries for the given documents, keeping the rest."""
+        merged = {e.document_id: e for e in self.read_manifest(agreement_dir)}
+        merged.update({e.document_id: e for e in entries})
+        return self.write_manifest(agreement_dir, list(merged.values()))
+
+    def load_exported(self, envelope_id: str) -> ExportedAgreement:
+        """Rebuild an :class:`ExportedAgreement` from a previously written envelope directory."""
+        agreement_dir, documents_dir, agreement_json = self.prepare_agreement_dirs(envelope_id)
+        manifest = self.read_manifest(agreement_dir)
+        return ExportedAgreement(
+            agreement=Agreement.model_validate_json(agreement_json.read_text(encoding="utf-8")),
+            agreement_dir=agreement_dir,
+            agreement_json_path=agreement_json,
+            documents_dir=documents_dir,
+            downloaded_files=[m.path for m in manifest],
+            manifest=manifest,
+        )
+
+    @staticmethod
+    def _index_row(e: ExportedAgreement) -> dict:
+        return {
+            "envelope_id": e.agreement.envelope.envelope_id,
+            "status": e.agreement.envelope.status,
+            "subject": e.agreement.envelope.subject,
+            "agreement_json": str(e.agreement_json_path),
+            "documents_dir": str(e.documents_dir),
+            "downloaded_files": [str(p) for p in e.downloaded_files],
+            "failures": e.failures,
+        }
+
     def write_index(self, exported: list[ExportedAgreement]) -> Path:
         index_path = self.out_dir / "index.json"
-        rows = []
-        for e in exported:
-            rows.append(
-                {
-                    "envelope_id": e.agreement.envelope.envelope_id,
-                    "status": e.agreement.envelope.status,
-                    "subject": e.agreement.envelope.subject,
-                    "agreement_json": str(e.agreement_json_path),
-                    "documents_dir": str(e.documents_dir),
-                    "downloaded_files": [str(p) for p in e.downloaded_files],
-                    "failures": e.failures,
-                }
-            )
+        rows = [self._index_row(e) for e in exported]
         index_path.write_text(json.dumps(rows, indent=2), encoding="utf-8")
         return index_path
 
+    def read_index(self) -> list[dict]:
+        index_path = self.out_dir / "index.json"
+        if not index_path.exists():
+            return []
+        return json.loads(index_path.read_text(encoding="utf-8"))
+
+    def merge_index(self, exported: list[ExportedAgreement]) -> Path:
+        """Upsert rows into an existing index.json, keyed by envelope_id.
+
+        Used by incremental writers (Connect worker, re-drives) that only hold a slice
+        of the export in memory.
+        """
+        with self._index_lock:
+            rows = {r["envelope_id"]: r for r in self.read_index()}
+            for e in exported:
+                rows[e.agreement.envelope.envelope_id] = self._index_row(e)
+            index_path = self.out_dir / "index.json"
+            tmp = index_path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(list(rows.values()), indent=2), encoding="utf-8")
+            tmp.replace(index_path)
+            return index_path
+
+    def read_failures(self) -> list[FailureRecord]:
+        failures_path = self.out_dir / "failures.json"
+        if not failures_path.exists():
+            return []
+        return [FailureRecord.model_validate(r) for r in json.loads(failures_path.read_text(encoding="utf-8"))]
+
+    def update_failures(
+        self, failed: list[FailureRecord], resolved: set[tuple[str, Optional[str]]]
+    ) -> Path:
+        """Persist failures for re-drive.
+
+        Drops ``resolved`` keys (and, for resolved envelopes, all of their document records),
+        then upserts ``failed``, carrying the attempt count forward from earlier runs.
+        """
+        with self._index_lock:
+            resolved_envelopes = {env_id for env_id, doc_id in resolved if doc_id is None}
+            previous = {r.key: r for r in self.read_failures()}
+            records = {
+                k: r
+                for k, r in previous.items()
+                if k not in resolved and r.envelope_id not in resolved_envelopes
+            }
+            for r in failed:
+                prev = previous.get(r.key)
+                records[r.key] = r.model_copy(update={"attempts": prev.attempts + 1}) if prev else r
+            failures_path = self.out_dir / "failures.json"
+            rows = [json.loads(r.model_dump_json()) for r in records.values()]
+            tmp = failures_path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+            tmp.replace(failures_path)
+            return failures_path
+
     def open_binary_for_write(self, path: Path):
         path.parent.mkdir(parents=True, exist_ok=True)
         return path.open("wb")
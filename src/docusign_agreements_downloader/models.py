@@ -7,6 +7,13 @@ from typing import Any, Literal, Optional
 from pydantic import BaseModel, Field
 
 
+# second element of FailureRecord.key for enrichment failures
+ENRICHMENT_KEY_PREFIX = "enrichment:"
+
+# rough size of a rendered PDF page, used when DocuSign does not report a byte size
+_BYTES_PER_PAGE_ESTIMATE = 100 * 1024
+
+
 class DocuSignAccount(BaseModel):
     account_id: str
     base_uri: str
@@ -35,6 +42,22 @@ class DocumentInfo(BaseModel):
     uri: Optional[str] = None
     raw: dict[str, Any] = Field(default_factory=dict)
 
+    @property
+    def estimated_size(self) -> Optional[int]:
+        """Best-effort byte size from listing metadata (``sizeBytes``, else ~page count)."""
+        for key in ("sizeBytes", "size"):
+            try:
+                return int(self.raw[key])
+            except (KeyError, TypeError, ValueError):
+                pass
+        pages = self.raw.get("pages")
+        if isinstance(pages, list):
+            pages = len(pages)
+        try:
+            return int(pages) * _BYTES_PER_PAGE_ESTIMATE if pages else None
+        except (TypeError, ValueError):
+            return None
+
 
 class Agreement(BaseModel):
     """Normalized domain model ('agreement' = one DocuSign envelope)."""
@@ -42,6 +65,69 @@ class Agreement(BaseModel):
     envelope: EnvelopeSummary
     documents: list[DocumentInfo] = Field(default_factory=list)
 
+    # optional enrichment (None = not requested); ``enrichments`` is the requested set,
+    # kept so re-drives fetch the same extras as the original run
+    enrichments: list[str] = Field(default_factory=list)
+    recipients: Optional[dict[str, Any]] = None
+    tabs: Optional[dict[str, Any]] = None
+    custom_fields: Optional[dict[str, Any]] = None
+    audit_events: Optional[list[dict[str, Any]]] = None
+
+
+class FileManifest(BaseModel):
+    """What was written for one document; used to verify the export later."""
+
+    document_id: str
+    path: Path
+    size: int = Field(..., ge=0)
+    sha256: str
+
+
+class FailureRecord(BaseModel):
+    """Structured failure for one envelope, one of its documents, or one enrichment call.
+
+    Envelope-level records have neither ``document_id`` nor ``component``; enrichment
+    records name the call in ``component`` (e.g. ``"audit_events"``).
+    """
+
+    envelope_id: str
+    document_id: Optional[str] = None
+    component: Optional[str] = None
+    endpoint: Optional[str] = None
+    http_status: Optional[int] = None
+    exception_class: str
+    message: str
+    attempts: int = Field(1, ge=1)
+    failed_at: datetime
+    # enrichments in force for the envelope (envelope-level and enrichment records)
+    enrich: Optional[list[str]] = None
+
+    @property
+    def level(self) -> Literal["envelope", "document", "enrichment"]:
+        if self.component is not None:
+            return "enrichment"
+        return "envelope" if self.document_id is None else "document"
+
+    @property
+    def key(self) -> tuple[str, Optional[str]]:
+        """``(envelope_id, document_id)``; enrichment records use ``"enrichment:<component>"``."""
+        if self.component is not None:
+            return (self.envelope_id, f"{ENRICHMENT_KEY_PREFIX}{self.component}")
+        return (self.envelope_id, self.document_id)
+
+    @property
+    def failure_class(self) -> str:
+        """Coarse grouping used to schedule re-drives."""
+        if self.http_status == 429:
+            return "rate_limited"
+        if self.http_status is not None and self.http_status >= 500:
+            return "server_error"
+        if self.http_status is not None:
+            return "client_error"
+        if self.exception_class.startswith("httpx."):
+            return "transport"
+        return "other"
+
 
 class ExportedAgreement(BaseModel):
     agreement: Agreement
@@ -49,13 +135,16 @@ class ExportedAgreement(BaseModel):
     agreement_json_path: Path
     documents_dir: Path
     downloaded_files: list[Path] = Field(default_factory=list)
+    manifest: list[FileManifest] = Field(default_factory=list)
     failures: list[str] = Field(default_factory=list)
+    failure_records: list[FailureRecord] = Field(default_factory=list)
 
 
 class DownloadResult(BaseModel):
     out_dir: Path
     exported: list[ExportedAgreement] = Field(default_factory=list)
     failures: list[str] = Field(default_factory=list)
+    failure_records: list[FailureRecord] = Field(default_factory=list)
     started_at: datetime
     finished_at: datetime
     status: Literal["ok", "partial", "failed"]
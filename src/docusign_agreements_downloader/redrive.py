@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel, Field
+
+from .client import DocuSignClient
+from .exporter import FilesystemExporter
+from .models import Agreement, EnvelopeSummary, ExportedAgreement, FailureRecord
+from .service import AgreementDownloadService, _failure_record
+
+# Cheapest-to-fix classes first; client errors (4xx) rarely succeed on retry.
+CLASS_ORDER = ("transport", "server_error", "rate_limited", "other", "client_error")
+
+
+class RetryResult(BaseModel):
+    attempted: int = 0
+    resolved: int = 0
+    skipped: int = 0
+    by_class: dict[str, int] = Field(default_factory=dict)
+    still_failing: list[FailureRecord] = Field(default_factory=list)
+
+
+class FailureRedriver:
+    """Re-drives the records in ``failures.json`` without repeating the whole date window.
+
+    Records are grouped by :attr:`FailureRecord.failure_class`; each group gets up to
+    ``rounds`` passes with exponential backoff between them. Envelope-level records
+    re-export the envelope (with the enrichments of the original run); document-level
+    records re-download only those documents, and enrichment records re-run only that call.
+    """
+
+    def __init__(
+        self,
+        service: AgreementDownloadService,
+        out_dir: Path,
+        concurrency: int = 4,
+        max_attempts: int = 5,
+        rounds: int = 3,
+        backoff_s: float = 2.0,
+        max_backoff_s: float = 60.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.service = service
+        self.exporter = FilesystemExporter(out_dir)
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.rounds = rounds
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self._sleep = sleep
+
+    def _failed(self, envelope_id: str, e: BaseException, enrich: Optional[list[str]] = None) -> ExportedAgreement:
+        summary = EnvelopeSummary(envelope_id=envelope_id, status="")
+        return ExportedAgreement(
+            agreement=Agreement(envelope=summary),
+            agreement_dir=self.exporter.out_dir / envelope_id,
+            agreement_json_path=self.exporter.out_dir / envelope_id / "agreement.json",
+            documents_dir=self.exporter.out_dir / envelope_id / "documents",
+            failures=[f"Envelope {envelope_id} failed: {e}"],
+            failure_records=[_failure_record(e, envelope_id, enrich=enrich)],
+        )
+
+    def _recorded_enrich(self, envelope_id: str, records: list[FailureRecord]) -> Optional[list[str]]:
+        """The enrichment set of the original run: from the records, else agreement.json."""
+        for r in records:
+            if r.enrich is not None:
+                return r.enrich
+        try:
+            return self.exporter.load_exported(envelope_id).agreement.enrichments
+        except (OSError, ValueError):
+            return None  # fall back to settings.enrich
+
+    def _redrive_envelope(
+        self,
+        api: DocuSignClient,
+        envelope_id: str,
+        records: list[FailureRecord],
+        row: Optional[dict[str, Any]],
+    ) -> ExportedAgreement:
+        if any(r.level == "envelope" for r in records):
+            enrich = self._recorded_enrich(envelope_id, records)
+            if row is None:
+                e = LookupError(f"Envelope {envelope_id} not returned by lookup")
+                return self._failed(envelope_id, e, enrich)
+            return self.service.export_envelope(api, self.exporter, row, enrich)
+
+        try:
+            exported = self.exporter.load_exported(envelope_id)
+        except (OSError, ValueError) as e:
+            # agreement.json missing or corrupt: becomes an envelope-level failure, which the
+            # next round (or run) fixes with a full re-export
+            return self._failed(envelope_id, e, self._recorded_enrich(envelope_id, records))
+        wanted = {r.document_id for r in records if r.level == "document"}
+        components = [r.component for r in records if r.component is not None]
+        if components:
+            self.service.redrive_enrichment(api, self.exporter, exported, components)
+        docs = [d for d in exported.agreement.documents if d.document_id in wanted]
+        self.service.download_documents(api, self.exporter, exported, docs)
+        return exported
+
+    def _run_round(
+        self, api: DocuSignClient, records: list[FailureRecord], concurrency: int
+    ) -> tuple[list[ExportedAgreement], list[FailureRecord], set[tuple[str, Optional[str]]]]:
+        by_envelope: dict[str, list[FailureRecord]] = defaultdict(list)
+        for r in records:
+            by_envelope[r.envelope_id].append(r)
+        needs_lookup = [
+            env_id for env_id, rs in by_envelope.items() if any(r.level == "envelope" for r in rs)
+        ]
+        rows: dict[str, dict[str, Any]] = {}
+        if needs_lookup:
+            for row in self.service.lookup_envelopes(api, needs_lookup):
+                rows[str(row.get("envelopeId"))] = row
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(
+                pool.map(
+                    lambda item: self._redrive_envelope(api, item[0], item[1], rows.get(item[0])),
+                    by_envelope.items(),
+                )
+            )
+
+        failed = [r for e in results for r in e.failure_records]
+        failed_keys = {r.key for r in failed}
+        failed_envelopes = {r.envelope_id for r in failed if r.level == "envelope"}
+        resolved = {
+            r.key
+            for r in records
+            if r.key not in failed_keys and r.envelope_id not in failed_envelopes
+        }
+        return results, failed, resolved
+
+    def run(self, classes: Optional[set[str]] = None) -> RetryResult:
+        result = RetryResult()
+        groups: dict[str, list[FailureRecord]] = defaultdict(list)
+        for r in self.exporter.read_failures():
+            if r.attempts >= self.max_attempts or (classes and r.failure_class not in classes):
+                result.skipped += 1
+                continue
+            groups[r.failure_class].append(r)
+        if not groups:
+            return result
+
+        touched: dict[str, ExportedAgreement] = {}
+        with self.service._http_scope() as http:
+            api = self.service._open_api(http)
+            for cls in sorted(groups, key=_class_rank):
+                pending = groups[cls]
+                result.by_class[cls] = len(pending)
+                result.attempted += len(pending)
+                # rate-limited items are retried serially so they do not re-trigger the limit
+                concurrency = 1 if cls == "rate_limited" else self.concurrency
+                for round_no in range(self.rounds):
+                    if round_no:
+                        self._sleep(min(self.max_backoff_s, self.backoff_s * 2 ** (round_no - 1)))
+                    exported, failed, resolved = self._run_round(api, pending, concurrency)
+                    self.exporter.update_failures(failed, resolved)
+                    touched.update({e.agreement.envelope.envelope_id: e for e in exported})
+                    result.resolved += len(resolved)
+                    failed_keys = {f.key for f in failed}
+                    pending = [
+                        r for r in self.exporter.read_failures()
+                        if r.key in failed_keys and r.attempts < self.max_attempts
+                    ]
+                    if not pending:
+                        break
+
+        if touched:
+            self.exporter.merge_index(list(touched.values()))
+        redriven = {r.envelope_id for rs in groups.values() for r in rs}
+        result.still_failing = [
+            r for r in self.exporter.read_failures() if r.envelope_id in redriven
+        ]
+        return result
+
+
+def _class_rank(failure_class: str) -> int:
+    return CLASS_ORDER.index(failure_class) if failure_class in CLASS_ORDER else len(CLASS_ORDER)
+
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import json
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, Optional
+
+Row = dict[str, Any]
+PriorityKey = tuple[float, ...]
+PriorityPolicy = Callable[[Row], PriorityKey]
+"""Maps a raw listing row to a sort key; smaller keys are downloaded first."""
+
+POLICY_NAMES = ("listing", "newest", "oldest", "sender", "smallest")
+
+
+def _timestamp(row: Row) -> Optional[float]:
+    v = row.get("completedDateTime") or row.get("createdDateTime")
+    if not v:
+        return None
+    try:
+        return datetime.fromisoformat(str(v).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def newest_first(row: Row) -> PriorityKey:
+    ts = _timestamp(row)
+    return (0.0, -ts) if ts is not None else (1.0, 0.0)
+
+
+def oldest_first(row: Row) -> PriorityKey:
+    ts = _timestamp(row)
+    return (0.0, ts) if ts is not None else (1.0, 0.0)
+
+
+def by_sender(senders: list[str]) -> PriorityPolicy:
+    """Envelopes from ``senders`` first, in the given order; everyone else after."""
+    rank = {s.lower(): i for i, s in enumerate(senders)}
+
+    def policy(row: Row) -> PriorityKey:
+        return (float(rank.get(str(row.get("senderEmail") or "").lower(), len(rank))),)
+
+    return policy
+
+
+def smallest_first(row: Row) -> PriorityKey:
+    """Smallest estimated envelope first; envelopes without size hints go last."""
+    from .models import DocumentInfo  # pydantic; keep this module cheap for the CLI
+
+    total = 0
+    for d in row.get("envelopeDocuments") or []:
+        size = DocumentInfo(document_id=str(d.get("documentId") or ""), name="", raw=d).estimated_size
+        if size is None:
+            return (1.0, 0.0)
+        total += size
+    return (0.0, float(total))
+
+
+def make_policy(name: str, senders: Optional[list[str]] = None) -> Optional[PriorityPolicy]:
+    """Policy by CLI name; ``listing`` (None) keeps DocuSign's order and skips scheduling."""
+    if name == "listing":
+        return None
+    if name == "newest":
+        return newest_first
+    if name == "oldest":
+        return oldest_first
+    if name == "sender":
+        if not senders:
+            raise ValueError("the 'sender' policy needs at least one sender")
+        return by_sender(senders)
+    if name == "smallest":
+        return smallest_first
+    raise ValueError(f"Unknown priority policy {name!r}; expected one of {', '.join(POLICY_NAMES)}")
+
+
+Entry = tuple[PriorityKey, int, Row]
+
+
+class _Run:
+    """One sorted spill file, read one entry at a time."""
+
+    def __init__(self, path: Path, size: int):
+        self.path = path
+        self.size = size
+        self.handle: IO[str] = path.open("r", encoding="utf-8")
+
+    def read(self) -> Optional[Entry]:
+        line = self.handle.readline()
+        if not line:
+            return None
+        key, seq, row = json.loads(line)
+        return (tuple(key), seq, row)
+
+    def close(self) -> None:
+        self.handle.close()
+        self.path.unlink(missing_ok=True)
+
+
+class SpillingPriorityQueue:
+    """Min-priority queue that keeps at most ``max_in_memory`` rows in RAM.
+
+    When the heap is full, its lower-priority half is written to disk as a sorted run;
+    :meth:`pop` merges the heap with the run heads (themselves kept in a heap), so order
+    is exact while memory stays bounded. Once more than ``max_open_runs`` runs exist, the
+    smaller half of them is k-way merged into one, bounding open file handles. Ties keep
+    insertion (listing) order.
+    """
+
+    def __init__(
+        self,
+        policy: PriorityPolicy,
+        max_in_memory: int = 10_000,
+        spill_dir: Optional[Path] = None,
+        max_open_runs: int = 64,
+    ):
+        self.policy = policy
+        self.max_in_memory = max(2, max_in_memory)
+        self.max_open_runs = max(2, max_open_runs)
+        self._spill_dir = spill_dir
+        self._tmp: Optional[tempfile.TemporaryDirectory[str]] = None
+        self._heap: list[Entry] = []
+        self._runs: dict[int, _Run] = {}
+        # (key, seq, run id, row): the current head of every run
+        self._heads: list[tuple[PriorityKey, int, int, Row]] = []
+        self._seq = itertools.count()
+        self._run_ids = itertools.count()
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def spilled_runs(self) -> int:
+        return len(self._runs)
+
+    def push(self, row: Row) -> None:
+        heapq.heappush(self._heap, (tuple(self.policy(row)), next(self._seq), row))
+        self._len += 1
+        if len(self._heap) >= self.max_in_memory:
+            self._spill()
+
+    def _run_path(self) -> tuple[int, Path]:
+        if self._tmp is None:
+            if self._spill_dir is not None:
+                self._spill_dir.mkdir(parents=True, exist_ok=True)
+            self._tmp = tempfile.TemporaryDirectory(prefix="dsa-spill-", dir=self._spill_dir)
+        run_id = next(self._run_ids)
+        return run_id, Path(self._tmp.name) / f"run-{run_id:05d}.jsonl"
+
+    def _write_run(self, entries: Iterable[Entry]) -> None:
+        run_id, path = self._run_path()
+        size = 0
+        with path.open("w", encoding="utf-8") as f:
+            for key, seq, row in entries:
+                f.write(json.dumps([list(key), seq, row]) + "\n")
+                size += 1
+        run = _Run(path, size)
+        head = run.read()
+        if head is None:
+            run.close()
+            return
+        self._runs[run_id] = run
+        heapq.heappush(self._heads, (head[0], head[1], run_id, head[2]))
+
+    def _spill(self) -> None:
+        entries = sorted(self._heap)
+        keep = len(entries) // 2
+        self._heap = entries[:keep]  # a sorted list is a valid heap
+        self._write_run(entries[keep:])
+        if len(self._runs) > self.max_open_runs:
+            self._compact()
+
+    def _compact(self) -> None:
+        """k-way merge the smaller half of the runs into one run."""
+        victims = set(sorted(self._runs, key=lambda r: self._runs[r].size)[: len(self._runs) // 2 + 1])
+        heads = {run_id: (key, seq, row) for key, seq, run_id, row in self._heads if run_id in victims}
+        self._heads = [h for h in self._heads if h[2] not in victims]
+        heapq.heapify(self._heads)
+
+        def entries(run_id: int) -> Iterator[Entry]:
+            run = self._runs[run_id]
+            entry: Optional[Entry] = heads[run_id]
+            while entry is not None:
+                yield entry
+                entry = run.read()
+
+        self._write_run(heapq.merge(*(entries(r) for r in victims)))
+        for run_id in victims:
+            self._runs.pop(run_id).close()
+
+    def pop(self) -> Row:
+        if not self._len:
+            raise IndexError("pop from empty SpillingPriorityQueue")
+        if self._heads and (not self._heap or self._heads[0][:2] < self._heap[0][:2]):
+            _, _, run_id, row = self._heads[0]
+            nxt = self._runs[run_id].read()
+            if nxt is None:
+                heapq.heappop(self._heads)
+                self._runs.pop(run_id).close()
+            else:
+                heapq.heapreplace(self._heads, (nxt[0], nxt[1], run_id, nxt[2]))
+        else:
+            row = heapq.heappop(self._heap)[2]
+        self._len -= 1
+        return row
+
+    def drain(self) -> Iterator[Row]:
+        while self._len:
+            yield self.pop()
+
+    def close(self) -> None:
+        for run in self._runs.values():
+            run.close()
+        self._runs = {}
+        self._heads = []
+        if self._tmp is not None:
+            self._tmp.cleanup()
+            self._tmp = None
+
+    def __enter__(self) -> "SpillingPriorityQueue":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -1,28 +1,121 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Sequence
 
 import httpx
 
 from .auth import fetch_access_token, fetch_userinfo_account
 from .client import ApiContext, DocuSignClient, ApiError
+from .columnar import ColumnarExporter
 from .config import Settings
+from .enrichment import (
+    CERTIFICATE_DOCUMENT_ID,
+    LISTING_INLINE,
+    flatten_audit_events,
+    parse_enrichments,
+    recipient_tabs,
+    without_tabs,
+)
 from .exporter import FilesystemExporter, safe_filename
-from .models import Agreement, DocumentInfo, EnvelopeSummary, ExportedAgreement, DownloadResult
+from .models import (
+    Agreement,
+    DocumentInfo,
+    DownloadResult,
+    EnvelopeSummary,
+    ExportedAgreement,
+    FailureRecord,
+    FileManifest,
+)
+from .scheduling import PriorityPolicy, SpillingPriorityQueue
+from .stream import DocumentStream, aiterate, prefetch
+from .throttle import LaneScheduler, Throttle
 from .util import guess_extension
 
+log = logging.getLogger(__name__)
+
+EnvelopeErrorCallback = Callable[[dict[str, Any], Exception], None]
+"""Called as ``on_error(listing_row, exception)`` for an envelope the iterators skip."""
+
+# Re-authenticate this long before the cached access token expires.
+_TOKEN_REFRESH_MARGIN_S = 300
+
+# Envelopes submitted ahead of the download workers, per worker.
+_ENVELOPES_IN_FLIGHT_PER_WORKER = 2
+
+# A document body cut off mid-transfer (read timeout, dropped connection) is fetched again
+# from the start, like the client's retries for other requests.
+_DOCUMENT_BODY_ATTEMPTS = 7
+_DOCUMENT_BODY_INITIAL_WAIT_S = 0.5
+_DOCUMENT_BODY_MAX_WAIT_S = 30.0
+
+# Per-envelope data requested inline from the listing endpoint. Inlining documents
+# removes one GET .../documents round trip per envelope.
+LISTING_INCLUDE: tuple[str, ...] = ("documents",)
+
+
+def listing_include(enrich: Sequence[str] = ()) -> tuple[str, ...]:
+    """:data:`LISTING_INCLUDE` plus whatever ``enrich`` needs that the listing can inline."""
+    return LISTING_INCLUDE + tuple(LISTING_INLINE[n] for n in enrich if n in LISTING_INLINE)
+
 
 class AgreementDownloadService:
     """High-level orchestration: auth -> list envelopes -> list docs -> download -> export."""
 
     def __init__(self, settings: Settings):
         self.settings = settings
+        self.throttle = Throttle.from_settings(settings)
+        self._lanes: Optional[LaneScheduler] = None
+        if settings.download_workers > 1:
+            self._lanes = LaneScheduler(
+                settings.download_workers, settings.large_document_bytes, settings.large_document_slots
+            )
+        # enrichment requests overlap the document downloads of the same envelope
+        self._enrich_pool = ThreadPoolExecutor(
+            max_workers=settings.enrichment_workers, thread_name_prefix="dsa-enrich"
+        )
+        # populated by keep_warm() for long-lived processes (daemon)
+        self._shared_http: Optional[httpx.Client] = None
+        self._api_lock = threading.Lock()
+        self._cached_api: Optional[tuple[DocuSignClient, float]] = None
 
     def _http_client(self) -> httpx.Client:
         return httpx.Client(timeout=httpx.Timeout(self.settings.http_timeout_s))
 
+    @contextmanager
+    def _http_scope(self) -> Iterator[httpx.Client]:
+        """The warm shared client when :meth:`keep_warm` was called, else a fresh one."""
+        if self._shared_http is not None:
+            yield self._shared_http
+            return
+        with self._http_client() as http:
+            yield http
+
+    def keep_warm(self) -> None:
+        """Keep one connection pool and the access token/account context across runs."""
+        if self._shared_http is None:
+            self._shared_http = self._http_client()
+
+    def close(self) -> None:
+        if self._shared_http is not None:
+            self._shared_http.close()
+            self._shared_http = None
+        self._cached_api = None
+        if self._lanes is not None:
+            self._lanes.shutdown()
+        self._enrich_pool.shutdown(wait=True)
+
+    def _enrichments(self, enrich: Optional[Sequence[str]]) -> tuple[str, ...]:
+        return parse_enrichments(self.settings.enrich if enrich is None else enrich)
+
     def _to_envelope_summary(self, raw: dict[str, Any]) -> EnvelopeSummary:
         env_id = raw.get("envelopeId") or raw.get("envelope_id")
         if not env_id:
@@ -56,6 +149,426 @@ class AgreementDownloadService:
             )
         return docs
 
+    def _raw_documents(self, api: DocuSignClient, env: dict[str, Any]) -> list[dict[str, Any]]:
+        """Document metadata for ``env``, preferring what the listing already inlined."""
+        inline = env.get("envelopeDocuments")
+        if inline is not None:
+            return list(inline)
+        env_id = str(env.get("envelopeId") or env.get("envelope_id"))
+        docs_payload = api.list_envelope_documents(env_id)
+        return docs_payload.get("envelopeDocuments") or docs_payload.get("documents") or []
+
+    def lookup_envelopes(
+        self,
+        api: DocuSignClient,
+        envelope_ids: list[str],
+        batch_size: int = 100,
+        include: Sequence[str] = LISTING_INCLUDE,
+    ) -> list[dict[str, Any]]:
+        """Fetch listing rows (with inlined documents) for specific envelopes in batches."""
+        rows: list[dict[str, Any]] = []
+        for i in range(0, len(envelope_ids), batch_size):
+            batch = envelope_ids[i : i + batch_size]
+            page = api.list_envelopes(
+                from_date=None,
+                to_date=None,
+                status="any",
+                page_size=len(batch),
+                include=include,
+                envelope_ids=batch,
+            )
+            rows.extend(page.get("envelopes") or [])
+        return rows
+
+    def _authenticate(self, http: httpx.Client) -> tuple[DocuSignClient, int]:
+        token = fetch_access_token(self.settings, http)
+        acct = fetch_userinfo_account(self.settings, http, token)
+        ctx = ApiContext(base_uri=acct.base_uri, account_id=acct.account_id)
+        api = DocuSignClient(
+            http=http, ctx=ctx, access_token=token.access_token, acquire_request=self.throttle.request
+        )
+        return api, token.expires_in
+
+    def _open_api(self, http: httpx.Client) -> DocuSignClient:
+        if http is not self._shared_http:
+            return self._authenticate(http)[0]
+        with self._api_lock:
+            cached = self._cached_api
+            if cached is None or time.monotonic() >= cached[1]:
+                api, expires_in = self._authenticate(http)
+                refresh_at = time.monotonic() + max(0, expires_in - _TOKEN_REFRESH_MARGIN_S)
+                self._cached_api = cached = (api, refresh_at)
+            return cached[0]
+
+    def iter_envelope_pages(
+        self,
+        api: DocuSignClient,
+        from_date: str,
+        to_date: Optional[str],
+        status: str,
+        page_size: int = 100,
+        include: Sequence[str] = LISTING_INCLUDE,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Yield raw listing pages until DocuSign reports the result set is exhausted."""
+        start_position = 0
+        while True:
+            page = api.list_envelopes(
+                from_date=from_date,
+                to_date=to_date,
+                status=status,
+                start_position=start_position,
+                page_size=page_size,
+                include=include,
+            )
+            envelopes = page.get("envelopes") or []
+            if not envelopes:
+                return
+            yield envelopes
+
+            # pagination: use DocuSign's startPosition/resultSetSize/totalSetSize when provided
+            result_set_size = int(page.get("resultSetSize") or len(envelopes))
+            total_set_size = int(page.get("totalSetSize") or (start_position + len(envelopes)))
+            next_start = start_position + result_set_size
+            if next_start >= total_set_size:
+                return
+            start_position = next_start
+
+    def download_document(
+        self,
+        api: DocuSignClient,
+        exporter: FilesystemExporter,
+        envelope_id: str,
+        doc: DocumentInfo,
+        documents_dir: Path,
+    ) -> FileManifest:
+        """Stream one document to disk, hashing it on the way through.
+
+        Every chunk is charged to the network and disk throttles; the document's estimated
+        size is held against the in-flight budget for the whole transfer. Unknown sizes
+        reserve ``settings.unknown_document_bytes``, and combined/archive renditions of
+        unknown size reserve the whole budget.
+
+        A transport error while reading the body reopens the stream and rewrites the file,
+        up to ``_DOCUMENT_BODY_ATTEMPTS`` times.
+        """
+        size_hint = _lane_size(doc)
+        reserved = self.throttle.inflight.acquire(
+            self.settings.unknown_document_bytes if size_hint is None else size_hint
+        )
+        try:
+            attempt = 1
+            while True:
+                # opening the stream retries its own transient failures in the client
+                resp = api.get_document_stream(envelope_id, doc.document_id)
+                try:
+                    return self._write_document(resp, exporter, doc, documents_dir)
+                except httpx.TransportError:
+                    # the body broke off mid-transfer: reopen and rewrite the file from the start
+                    if attempt >= _DOCUMENT_BODY_ATTEMPTS:
+                        raise
+                finally:
+                    resp.close()
+                time.sleep(min(_DOCUMENT_BODY_MAX_WAIT_S, _DOCUMENT_BODY_INITIAL_WAIT_S * 2 ** (attempt - 1)))
+                attempt += 1
+        finally:
+            self.throttle.inflight.release(reserved)
+
+    def _write_document(
+        self, resp: httpx.Response, exporter: FilesystemExporter, doc: DocumentInfo, documents_dir: Path
+    ) -> FileManifest:
+        ext = guess_extension(resp.headers.get("content-type"))
+        out_path = documents_dir / f"{doc.document_id}_{safe_filename(doc.name)}.{ext}"
+        digest = hashlib.sha256()
+        size = 0
+        with exporter.open_binary_for_write(out_path) as f:
+            for chunk in resp.iter_bytes():
+                if chunk:
+                    self.throttle.network(len(chunk))
+                    self.throttle.disk(len(chunk))
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+        return FileManifest(document_id=doc.document_id, path=out_path, size=size, sha256=digest.hexdigest())
+
+    def download_documents(
+        self,
+        api: DocuSignClient,
+        exporter: FilesystemExporter,
+        exported_agreement: ExportedAgreement,
+        docs: list[DocumentInfo],
+    ) -> None:
+        """Download ``docs`` into ``exported_agreement``, isolating failures per document.
+
+        Successful downloads are merged into the envelope's ``manifest.json``.
+        """
+        env_id = exported_agreement.agreement.envelope.envelope_id
+        documents_dir = exported_agreement.documents_dir
+        outcomes: list[FileManifest | BaseException] = []
+        lanes = self._lanes
+        if lanes is not None:
+            futures = [
+                lanes.submit(_lane_size(d), self.download_document, api, exporter, env_id, d, documents_dir)
+                for d in docs
+            ]
+            for fut in futures:
+                try:
+                    outcomes.append(fut.result())
+                except Exception as e:
+                    outcomes.append(e)
+        else:
+            for doc in docs:
+                try:
+                    outcomes.append(self.download_document(api, exporter, env_id, doc, documents_dir))
+                except Exception as e:
+                    outcomes.append(e)
+
+        fresh: list[FileManifest] = []
+        for doc, outcome in zip(docs, outcomes):
+            if isinstance(outcome, BaseException):
+                exported_agreement.failures.append(f"Envelope {env_id} document {doc.document_id} failed: {outcome}")
+                exported_agreement.failure_records.append(_failure_record(outcome, env_id, doc.document_id))
+                continue
+            fresh.append(outcome)
+            exported_agreement.downloaded_files.append(outcome.path)
+        if fresh:
+            exporter.merge_manifest(exported_agreement.agreement_dir, fresh)
+        # keep the in-memory manifest in step with disk (re-drives start from a partial one)
+        done = {e.document_id for e in fresh}
+        exported_agreement.manifest = [e for e in exported_agreement.manifest if e.document_id not in done] + fresh
+
+    def _to_agreement(self, api: DocuSignClient, env: dict[str, Any]) -> Agreement:
+        return Agreement(
+            envelope=self._to_envelope_summary(env),
+            documents=self._to_documents(self._raw_documents(api, env)),
+        )
+
+    def _iter_agreements(
+        self,
+        api: DocuSignClient,
+        from_date: str,
+        to_date: Optional[str],
+        status: str,
+        page_size: int,
+        prefetch_envelopes: int,
+        on_error: Optional[EnvelopeErrorCallback],
+    ) -> Iterator[Agreement]:
+        rows = (
+            env
+            for page in self.iter_envelope_pages(api, from_date, to_date, status, page_size)
+            for env in page
+        )
+
+        def resolve(env: dict[str, Any]) -> Optional[Agreement]:
+            try:
+                return self._to_agreement(api, env)
+            except Exception as e:
+                if on_error is None:
+                    log.warning("skipping envelope %s: %s", env.get("envelopeId"), e)
+                else:
+                    on_error(env, e)
+                return None
+
+        for agreement in prefetch((resolve(env) for env in rows), prefetch_envelopes):
+            if agreement is not None:
+                yield agreement
+
+    def iter_agreements(
+        self,
+        from_date: str,
+        to_date: Optional[str] = None,
+        status: str = "completed",
+        page_size: int = 100,
+        prefetch_envelopes: int = 8,
+        on_error: Optional[EnvelopeErrorCallback] = None,
+    ) -> Iterator[Agreement]:
+        """Yield :class:`Agreement` objects lazily as listing pages arrive; nothing is written.
+
+        Up to ``prefetch_envelopes`` agreements are resolved ahead of the consumer on a
+        background thread; a slower consumer pauses listing rather than buffering it.
+
+        An envelope that cannot be resolved (bad listing row, failed documents lookup) is
+        skipped and logged, or passed to ``on_error(row, exception)`` on the background
+        thread; raising from ``on_error`` ends the iteration with that exception. Listing
+        failures always end the iteration.
+        """
+        with self._http_scope() as http:
+            api = self._open_api(http)
+            yield from self._iter_agreements(
+                api, from_date, to_date, status, page_size, prefetch_envelopes, on_error
+            )
+
+    def iter_documents(
+        self,
+        from_date: str,
+        to_date: Optional[str] = None,
+        status: str = "completed",
+        page_size: int = 100,
+        prefetch_envelopes: int = 8,
+        on_error: Optional[EnvelopeErrorCallback] = None,
+    ) -> Iterator[DocumentStream]:
+        """Yield each document as a :class:`DocumentStream` whose bytes are fetched on demand.
+
+        A stream is closed when the consumer advances, so read it before asking for the next.
+        Envelopes that cannot be resolved are handled as in :meth:`iter_agreements`.
+        """
+        with self._http_scope() as http:
+            api = self._open_api(http)
+            for agreement in self._iter_agreements(
+                api, from_date, to_date, status, page_size, prefetch_envelopes, on_error
+            ):
+                for doc in agreement.documents:
+                    resp = api.get_document_stream(agreement.envelope.envelope_id, doc.document_id)
+                    stream = DocumentStream(
+                        agreement=agreement,
+                        document=doc,
+                        content_type=resp.headers.get("content-type"),
+                        _response=resp,
+                        _on_chunk=self.throttle.network,
+                    )
+                    try:
+                        yield stream
+                    finally:
+                        stream.close()
+
+    def aiter_agreements(self, *args: Any, **kwargs: Any) -> AsyncIterator[Agreement]:
+        """Async counterpart of :meth:`iter_agreements` (same arguments)."""
+        return aiterate(self.iter_agreements(*args, **kwargs))
+
+    def aiter_documents(self, *args: Any, **kwargs: Any) -> AsyncIterator[DocumentStream]:
+        """Async counterpart of :meth:`iter_documents`; use ``DocumentStream.aiter_bytes()``."""
+        return aiterate(self.iter_documents(*args, **kwargs))
+
+    def _enrichment_calls(
+        self, api: DocuSignClient, env_id: str, env: dict[str, Any], enrich: Sequence[str]
+    ) -> dict[str, Callable[[], Any]]:
+        """One zero-argument call per API request ``enrich`` needs, reusing inlined listing data."""
+        calls: dict[str, Callable[[], Any]] = {}
+        if "tabs" in enrich:
+            # one request covers both: recipients with their tabs embedded
+            calls["recipients"] = lambda: api.list_envelope_recipients(env_id, include_tabs=True)
+        elif "recipients" in enrich:
+            inline = env.get("recipients")
+            calls["recipients"] = (lambda: inline) if inline is not None else (
+                lambda: api.list_envelope_recipients(env_id)
+            )
+        if "custom_fields" in enrich:
+            inline_fields = env.get("customFields")
+            calls["custom_fields"] = (lambda: inline_fields) if inline_fields is not None else (
+                lambda: api.list_envelope_custom_fields(env_id)
+            )
+        if "audit_events" in enrich:
+            calls["audit_events"] = lambda: api.list_envelope_audit_events(env_id)
+        return calls
+
+    def _collect_enrichment(
+        self,
+        exported_agreement: ExportedAgreement,
+        futures: dict[str, Future[Any]],
+        enrich: Sequence[str],
+    ) -> None:
+        agreement = exported_agreement.agreement
+        env_id = agreement.envelope.envelope_id
+        for name, fut in futures.items():
+            try:
+                payload = fut.result()
+            except Exception as e:
+                exported_agreement.failures.append(f"Envelope {env_id} {name} enrichment failed: {e}")
+                exported_agreement.failure_records.append(
+                    _failure_record(e, env_id, component=name, enrich=list(enrich))
+                )
+                continue
+            if name == "recipients":
+                if "recipients" in enrich:
+                    agreement.recipients = without_tabs(payload or {})
+                if "tabs" in enrich:
+                    agreement.tabs = recipient_tabs(payload or {})
+            elif name == "custom_fields":
+                agreement.custom_fields = payload or {}
+            elif name == "audit_events":
+                agreement.audit_events = flatten_audit_events(payload)
+
+    def redrive_enrichment(
+        self,
+        api: DocuSignClient,
+        exporter: FilesystemExporter,
+        exported_agreement: ExportedAgreement,
+        components: Sequence[str],
+    ) -> None:
+        """Re-run only the named enrichment calls and merge their results into ``agreement.json``.
+
+        Uses the enrichment set recorded in the agreement, so tabs are re-fetched along with
+        recipients when the original run asked for them.
+        """
+        agreement = exported_agreement.agreement
+        enrich = tuple(agreement.enrichments) or self._enrichments(None)
+        calls = self._enrichment_calls(api, agreement.envelope.envelope_id, {}, enrich)
+        futures = {name: self._enrich_pool.submit(call) for name, call in calls.items() if name in components}
+        self._collect_enrichment(exported_agreement, futures, enrich)
+        exporter.write_agreement_json(agreement, exported_agreement.agreement_json_path)
+
+    def export_envelope(
+        self,
+        api: DocuSignClient,
+        exporter: FilesystemExporter,
+        env: dict[str, Any],
+        enrich: Optional[Sequence[str]] = None,
+    ) -> ExportedAgreement:
+        """Export one listing row (metadata + documents). Failures are recorded, not raised.
+
+        ``enrich`` (default: ``settings.enrich``) names extras from ``enrichment.ENRICHMENTS``; their
+        requests run on the enrichment pool while the documents download, and the results
+        are written into ``agreement.json`` once both are done.
+        """
+        requested: Optional[list[str]] = None
+        try:
+            enrich = self._enrichments(enrich)
+            requested = list(enrich)
+            env_summary = self._to_envelope_summary(env)
+            env_id = env_summary.envelope_id
+
+            agreement_dir, documents_dir, agreement_json = exporter.prepare_agreement_dirs(env_id)
+            exported_agreement = ExportedAgreement(
+                agreement=Agreement(envelope=env_summary, documents=[], enrichments=requested),
+                agreement_dir=agreement_dir,
+                agreement_json_path=agreement_json,
+                documents_dir=documents_dir,
+            )
+
+            futures = {
+                name: self._enrich_pool.submit(call)
+                for name, call in self._enrichment_calls(api, env_id, env, enrich).items()
+            }
+
+            raw_docs = self._raw_documents(api, env)
+            docs = self._to_documents(raw_docs)
+            if "certificate" in enrich and all(d.document_id != CERTIFICATE_DOCUMENT_ID for d in docs):
+                docs.append(DocumentInfo(document_id=CERTIFICATE_DOCUMENT_ID, name="certificate_of_completion"))
+            exported_agreement.agreement.documents = docs
+
+            exporter.write_agreement_json(exported_agreement.agreement, agreement_json)
+            exporter.write_manifest(agreement_dir, [])
+            self.download_documents(api, exporter, exported_agreement, exported_agreement.agreement.documents)
+
+            if futures:
+                self._collect_enrichment(exported_agreement, futures, enrich)
+                exporter.write_agreement_json(exported_agreement.agreement, agreement_json)
+
+        except (ApiError, Exception) as e:
+            env_id = str(env.get("envelopeId") or "unknown")
+            msg = f"Envelope {env_id} failed: {e}"
+            exported_agreement = ExportedAgreement(
+                agreement=Agreement(
+                    envelope=EnvelopeSummary(envelope_id=env_id, status=str(env.get("status") or "")),
+                    documents=[],
+                ),
+                agreement_dir=exporter.out_dir / env_id,
+                agreement_json_path=exporter.out_dir / env_id / "agreement.json",
+                documents_dir=exporter.out_dir / env_id / "documents",
+                failures=[msg],
+                failure_records=[_failure_record(e, env_id, enrich=requested)],
+            )
+        return exported_agreement
+
     def download(
         self,
         out_dir: Path,
@@ -63,90 +576,76 @@ class AgreementDownloadService:
         to_date: Optional[str],
         status: str,
         page_size: int = 100,
+        priority: Optional[PriorityPolicy] = None,
+        max_in_memory: int = 10_000,
+        enrich: Optional[Sequence[str]] = None,
+        columnar: Optional[str] = None,
     ) -> DownloadResult:
+        """Export every envelope in the window.
+
+        With a ``priority`` policy the whole window is listed first (cheap) and envelopes are
+        then downloaded in policy order through a priority queue that keeps at most
+        ``max_in_memory`` listing rows in RAM and spills the rest under ``out_dir/.spill``.
+        ``enrich`` is passed to :meth:`export_envelope`. ``columnar`` (``"parquet"`` or
+        ``"arrow"``, default ``settings.columnar_format``) also appends each envelope to the
+        date-partitioned tables under ``out_dir/columnar`` as it finishes.
+        """
         started = datetime.now(tz=timezone.utc)
         out_dir = out_dir.resolve()
         out_dir.mkdir(parents=True, exist_ok=True)
         exporter = FilesystemExporter(out_dir)
+        columnar = columnar or self.settings.columnar_format
+        tables = ColumnarExporter(out_dir, columnar) if columnar else None
 
         exported: list[ExportedAgreement] = []
         failures: list[str] = []
+        failure_records: list[FailureRecord] = []
 
-        with self._http_client() as http:
-            token = fetch_access_token(self.settings, http)
-            acct = fetch_userinfo_account(self.settings, http, token)
-            ctx = ApiContext(base_uri=acct.base_uri, account_id=acct.account_id)
-            api = DocuSignClient(http=http, ctx=ctx, access_token=token.access_token)
+        enrich = self._enrichments(enrich)
+        workers = self.settings.download_workers
+        with (
+            self._http_scope() as http,
+            ThreadPoolExecutor(max_workers=workers) as envelope_pool,
+            tables if tables is not None else nullcontext(),
+        ):
+            api = self._open_api(http)
+            pages = self.iter_envelope_pages(
+                api, from_date, to_date, status, page_size, include=listing_include(enrich)
+            )
+            if priority is not None:
+                pages = _prioritized(pages, priority, page_size, max_in_memory, out_dir / ".spill")
+            # A bounded window of envelopes in flight across page boundaries: a slow envelope
+            # holds one slot instead of stalling the next page until it finishes.
+            window = threading.BoundedSemaphore(workers * _ENVELOPES_IN_FLIGHT_PER_WORKER)
+            futures: list[Future[ExportedAgreement]] = []
+            pending: set[Future[ExportedAgreement]] = set()
 
-            start_position = 0
-            while True:
-                page = api.list_envelopes(
-                    from_date=from_date,
-                    to_date=to_date,
-                    status=status,
-                    start_position=start_position,
-                    page_size=page_size,
-                )
-                envelopes = page.get("envelopes") or []
-                if not envelopes:
-                    break
+            def collect(fut: Future[ExportedAgreement]) -> None:
+                pending.discard(fut)
+                if tables is not None:
+                    tables.add(fut.result())
 
+            for envelopes in pages:
                 for env in envelopes:
-                    try:
-                        env_summary = self._to_envelope_summary(env)
-                        env_id = env_summary.envelope_id
-
-                        agreement_dir, documents_dir, agreement_json = exporter.prepare_agreement_dirs(env_id)
-                        exported_agreement = ExportedAgreement(
-                            agreement=Agreement(envelope=env_summary, documents=[]),
-                            agreement_dir=agreement_dir,
-                            agreement_json_path=agreement_json,
-                            documents_dir=documents_dir,
-                        )
-
-                        docs_payload = api.list_envelope_documents(env_id)
-                        raw_docs = docs_payload.get("envelopeDocuments") or docs_payload.get("documents") or []
-                        exported_agreement.agreement.documents = self._to_documents(raw_docs)
-
-                        exporter.write_agreement_json(exported_agreement.agreement, agreement_json)
-
-                        for doc in exported_agreement.agreement.documents:
-                            resp = api.get_document_stream(env_id, doc.document_id)
-                            ext = guess_extension(resp.headers.get("content-type"))
-                            file_name = f"{doc.document_id}_{safe_filename(doc.name)}.{ext}"
-                            out_path = documents_dir / file_name
-
-                            with exporter.open_binary_for_write(out_path) as f:
-                                for chunk in resp.iter_bytes():
-                                    if chunk:
-                                        f.write(chunk)
-                            exported_agreement.downloaded_files.append(out_path)
-
-                    except (ApiError, Exception) as e:
-                        env_id = str(env.get("envelopeId") or "unknown")
-                        msg = f"Envelope {env_id} failed: {e}"
-                        failures.append(msg)
-                        exported_agreement = ExportedAgreement(
-                            agreement=Agreement(
-                                envelope=EnvelopeSummary(envelope_id=env_id, status=str(env.get("status") or "")),
-                                documents=[],
-                            ),
-                            agreement_dir=out_dir / env_id,
-                            agreement_json_path=out_dir / env_id / "agreement.json",
-                            documents_dir=out_dir / env_id / "documents",
-                            failures=[msg],
-                        )
-                    exported.append(exported_agreement)
-
-                # pagination: use DocuSign's startPosition/resultSetSize/totalSetSize when provided
-                result_set_size = int(page.get("resultSetSize") or len(envelopes))
-                total_set_size = int(page.get("totalSetSize") or (start_position + len(envelopes)))
-                next_start = start_position + result_set_size
-                if next_start >= total_set_size:
-                    break
-                start_position = next_start
+                    window.acquire()
+                    fut = envelope_pool.submit(self.export_envelope, api, exporter, env, enrich)
+                    fut.add_done_callback(lambda _: window.release())
+                    futures.append(fut)
+                    pending.add(fut)
+                    for done in [f for f in pending if f.done()]:
+                        collect(done)
+            for done in as_completed(list(pending)):
+                collect(done)
+
+        # results keep listing (or priority) order, whatever order they completed in
+        for fut in futures:
+            exported_agreement = fut.result()
+            failures.extend(exported_agreement.failures)
+            failure_records.extend(exported_agreement.failure_records)
+            exported.append(exported_agreement)
 
         exporter.write_index(exported)
+        exporter.update_failures(failure_records, resolved=_resolved_keys(exported))
         finished = datetime.now(tz=timezone.utc)
         if exported and failures:
             status_out = "partial"
@@ -158,12 +657,85 @@ class AgreementDownloadService:
             out_dir=out_dir,
             exported=exported,
             failures=failures,
+            failure_records=failure_records,
             started_at=started,
             finished_at=finished,
             status=status_out,
         )
 
 
+def _failure_record(
+    e: BaseException,
+    envelope_id: str,
+    document_id: Optional[str] = None,
+    component: Optional[str] = None,
+    enrich: Optional[list[str]] = None,
+) -> FailureRecord:
+    endpoint: Optional[str] = None
+    http_status: Optional[int] = None
+    if isinstance(e, ApiError):
+        endpoint, http_status = e.endpoint, e.status_code
+    elif isinstance(e, httpx.RequestError):
+        try:
+            endpoint = f"{e.request.method} {e.request.url.path}"
+        except RuntimeError:  # request not attached
+            pass
+    cls = type(e)
+    module = cls.__module__.split(".")[0]
+    return FailureRecord(
+        envelope_id=envelope_id,
+        document_id=document_id,
+        component=component,
+        endpoint=endpoint,
+        http_status=http_status,
+        exception_class=cls.__name__ if module == "builtins" else f"{module}.{cls.__name__}",
+        message=str(e),
+        failed_at=datetime.now(tz=timezone.utc),
+        enrich=enrich,
+    )
+
+
+def _prioritized(
+    pages: Iterator[list[dict[str, Any]]],
+    policy: PriorityPolicy,
+    batch_size: int,
+    max_in_memory: int,
+    spill_dir: Path,
+) -> Iterator[list[dict[str, Any]]]:
+    """Re-batch listing rows in priority order."""
+    with SpillingPriorityQueue(policy, max_in_memory=max_in_memory, spill_dir=spill_dir) as q:
+        for page in pages:
+            for env in page:
+                q.push(env)
+        batch: list[dict[str, Any]] = []
+        for env in q.drain():
+            batch.append(env)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _lane_size(doc: DocumentInfo) -> Optional[int]:
+    # the combined/archive renditions are as large as every document together
+    if doc.document_id in ("combined", "archive") and doc.estimated_size is None:
+        return sys.maxsize
+    return doc.estimated_size
+
+
+def _resolved_keys(exported: list[ExportedAgreement]) -> set[tuple[str, Optional[str]]]:
+    """Failure keys that the given results show as no longer failing."""
+    resolved: set[tuple[str, Optional[str]]] = set()
+    for e in exported:
+        env_id = e.agreement.envelope.envelope_id
+        if any(r.level == "envelope" for r in e.failure_records):
+            continue
+        resolved.add((env_id, None))
+        resolved.update((env_id, m.document_id) for m in e.manifest)
+    return resolved
+
+
 def _parse_dt(v: Any):
     if not v:
         return None
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Iterable, Iterator, Optional, TypeVar
+
+import httpx
+
+from .models import Agreement, DocumentInfo
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _Raised:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def prefetch(items: Iterable[T], ahead: int) -> Iterator[T]:
+    """Produce ``items`` on a background thread, at most ``ahead`` in front of the consumer.
+
+    The bounded queue is the backpressure: a slow consumer stalls the producer instead of
+    letting it buffer a whole listing. Producer exceptions are re-raised in the consumer.
+    Closing the returned generator stops the producer.
+    """
+    if ahead <= 0:
+        yield from items
+        return
+
+    q: queue.Queue[object] = queue.Queue(maxsize=ahead)
+    stop = threading.Event()
+
+    def put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except BaseException as e:  # forwarded to the consumer
+            put(_Raised(e))
+            return
+        put(_DONE)
+
+    t = threading.Thread(target=produce, name="dsa-prefetch", daemon=True)
+    t.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Raised):
+                raise item.exc
+            yield item  # type: ignore[misc]
+    finally:
+        stop.set()
+        t.join()
+
+
+async def aiterate(it: Iterator[T]) -> AsyncIterator[T]:
+    """Drive a blocking iterator from asyncio, one ``next()`` per worker-thread hop."""
+    try:
+        while True:
+            item = await asyncio.to_thread(next, it, _DONE)
+            if item is _DONE:
+                return
+            yield item  # type: ignore[misc]
+    finally:
+        close = getattr(it, "close", None)
+        if close is not None:
+            await asyncio.to_thread(close)
+
+
+@dataclass
+class DocumentStream:
+    """One document's bytes, streamed from DocuSign on demand.
+
+    Valid until the iterator that produced it advances; read it (or copy what you need)
+    before asking for the next document.
+    """
+
+    agreement: Agreement
+    document: DocumentInfo
+    content_type: Optional[str]
+    _response: httpx.Response = field(repr=False)
+    _on_chunk: Callable[[int], None] = field(repr=False, default=lambda n: None)
+
+    def iter_bytes(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        for chunk in self._response.iter_bytes(chunk_size):
+            if chunk:
+                self._on_chunk(len(chunk))
+                yield chunk
+
+    def read(self) -> bytes:
+        return b"".join(self.iter_bytes())
+
+    async def aiter_bytes(self, chunk_size: Optional[int] = None) -> AsyncIterator[bytes]:
+        async for chunk in aiterate(self.iter_bytes(chunk_size)):
+            yield chunk
+
+    def close(self) -> None:
+        self._response.close()
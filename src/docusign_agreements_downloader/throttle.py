@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``consume(n)`` blocks until ``n`` tokens are available.
+
+    A ``rate`` of ``None`` (or 0) disables limiting.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float],
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate or None
+        self.capacity = float(burst or (rate or 0))
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def consume(self, n: int) -> None:
+        if self.rate is None or n <= 0:
+            return
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # go into debt rather than refusing requests larger than the bucket
+            self._tokens -= n
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+
+
+class ByteBudget:
+    """Caps the bytes of documents in flight at once. ``None`` disables the cap."""
+
+    def __init__(self, max_bytes: Optional[int]):
+        self.max_bytes = max_bytes or None
+        self._used = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, n: int) -> int:
+        """Reserve ``n`` bytes (clamped to the budget) and return what was reserved."""
+        max_bytes = self.max_bytes
+        if max_bytes is None:
+            return 0
+        n = max(0, min(n, max_bytes))
+        with self._cond:
+            self._cond.wait_for(lambda: self._used + n <= max_bytes)
+            self._used += n
+        return n
+
+    def release(self, n: int) -> None:
+        if self.max_bytes is None or n <= 0:
+            return
+        with self._cond:
+            self._used -= n
+            self._cond.notify_all()
+
+
+class Throttle:
+    """Network, disk, in-flight and API request limits shared by every worker.
+
+    ``network(n)`` charges both the global bucket and the calling thread's own bucket,
+    so one worker cannot use the whole global allowance.
+    """
+
+    def __init__(
+        self,
+        bandwidth_bps: Optional[float] = None,
+        per_worker_bandwidth_bps: Optional[float] = None,
+        disk_write_bps: Optional[float] = None,
+        max_inflight_bytes: Optional[int] = None,
+        requests_per_s: Optional[float] = None,
+    ):
+        self._global = TokenBucket(bandwidth_bps)
+        self._requests = TokenBucket(requests_per_s, burst=max(1.0, requests_per_s or 0))
+        self._per_worker_bps = per_worker_bandwidth_bps
+        self._local = threading.local()
+        self._disk = TokenBucket(disk_write_bps)
+        self.inflight = ByteBudget(max_inflight_bytes)
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "Throttle":
+        return cls(
+            bandwidth_bps=settings.bandwidth_bps,
+            per_worker_bandwidth_bps=settings.per_worker_bandwidth_bps,
+            disk_write_bps=settings.disk_write_bps,
+            max_inflight_bytes=settings.max_inflight_bytes,
+            requests_per_s=settings.api_requests_per_s,
+        )
+
+    def network(self, n: int) -> None:
+        bucket = getattr(self._local, "bucket", None)
+        if bucket is None:
+            bucket = self._local.bucket = TokenBucket(self._per_worker_bps)
+        bucket.consume(n)
+        self._global.consume(n)
+
+    def disk(self, n: int) -> None:
+        self._disk.consume(n)
+
+    def request(self) -> None:
+        """Charge one API request against the shared request budget."""
+        self._requests.consume(1)
+
+
+class LaneScheduler:
+    """Runs small and large documents on separate worker lanes.
+
+    Large documents (``size >= large_bytes``, or unknown size flagged as large by the
+    caller) only ever occupy ``large_slots`` workers, so a huge combined PDF cannot
+    starve the small documents queued behind it.
+    """
+
+    def __init__(self, workers: int, large_bytes: int, large_slots: int = 1):
+        large_slots = max(1, min(large_slots, workers))
+        self.large_bytes = large_bytes
+        self._small = ThreadPoolExecutor(max_workers=max(1, workers - large_slots), thread_name_prefix="dsa-small")
+        self._large = ThreadPoolExecutor(max_workers=large_slots, thread_name_prefix="dsa-large")
+
+    def is_large(self, size: Optional[int]) -> bool:
+        return size is not None and size >= self.large_bytes
+
+    def submit(self, size: Optional[int], fn: Callable[..., T], *args: Any) -> Future[T]:
+        pool = self._large if self.is_large(size) else self._small
+        return pool.submit(fn, *args)
+
+    def shutdown(self) -> None:
+        self._small.shutdown(wait=True)
+        self._large.shutdown(wait=True)
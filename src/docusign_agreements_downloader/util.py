@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import mmap
+from pathlib import Path
 from typing import Optional
 
+_HASH_CHUNK = 8 * 1024 * 1024
+
 
 def guess_extension(content_type: Optional[str]) -> str:
     if not content_type:
@@ -16,3 +21,18 @@ def guess_extension(content_type: Optional[str]) -> str:
         "image/png": "png",
         "image/jpeg": "jpg",
     }.get(ct, "bin")
+
+
+def hash_file(path: Path, chunk_size: int = _HASH_CHUNK) -> str:
+    """SHA-256 of a file via a read-only mmap (no per-chunk read() copies into Python)."""
+    h = hashlib.sha256()
+    size = path.stat().st_size
+    if size == 0:
+        return h.hexdigest()
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        if hasattr(m, "madvise"):
+            m.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(m) as view:
+            for off in range(0, size, chunk_size):
+                h.update(view[off : off + chunk_size])
+    return h.hexdigest()
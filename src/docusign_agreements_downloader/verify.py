@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Literal, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from .exporter import FilesystemExporter
+from .models import Agreement, ExportedAgreement, FileManifest
+from .service import AgreementDownloadService
+from .util import hash_file
+
+IssueKind = Literal[
+    "invalid_agreement_json",
+    "invalid_manifest",
+    "missing_document",
+    "size_mismatch",
+    "hash_mismatch",
+    "recorded_failure",
+]
+
+ProgressCallback = Callable[[int, int, int], None]
+"""Called as ``progress(agreements_done, agreements_total, bytes_checked)``."""
+
+
+class VerifyIssue(BaseModel):
+    envelope_id: str
+    kind: IssueKind
+    document_id: Optional[str] = None
+    path: Optional[Path] = None
+    detail: str = ""
+
+
+class VerifyReport(BaseModel):
+    out_dir: Path
+    agreements_checked: int = 0
+    files_checked: int = 0
+    bytes_checked: int = 0
+    issues: list[VerifyIssue] = Field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+
+class ExportVerifier:
+    """Checks an export tree against ``agreement.json`` and ``manifest.json``.
+
+    Agreements are found by scanning ``<out_dir>/*/agreement.json``, so a run that was
+    killed before writing ``index.json`` (or envelopes from earlier date windows) are
+    still checked. ``index.json`` is only a hint: it adds envelopes that failed before
+    their directory was written, and their recorded failures. A directory with
+    ``documents/`` or ``manifest.json`` but no ``agreement.json`` is reported, not skipped.
+    """
+
+    def __init__(self, out_dir: Path, workers: int = 8, check_hashes: bool = True):
+        self.exporter = FilesystemExporter(out_dir)
+        self.workers = workers
+        self.check_hashes = check_hashes
+
+    def _check_file(self, envelope_id: str, entry: FileManifest) -> tuple[list[VerifyIssue], int]:
+        def issue(kind: IssueKind, detail: str = "") -> VerifyIssue:
+            return VerifyIssue(
+                envelope_id=envelope_id, kind=kind, document_id=entry.document_id, path=entry.path, detail=detail
+            )
+
+        try:
+            size = entry.path.stat().st_size
+        except FileNotFoundError:
+            return [issue("missing_document")], 0
+        if size != entry.size:
+            return [issue("size_mismatch", f"expected {entry.size} bytes, found {size}")], size
+        if self.check_hashes and hash_file(entry.path) != entry.sha256:
+            return [issue("hash_mismatch")], size
+        return [], size
+
+    def _candidates(self) -> list[dict]:
+        """One row per envelope directory, plus ``index.json`` rows without a directory."""
+        out_dir = self.exporter.out_dir
+        hints = {r["envelope_id"]: r for r in self.exporter.read_index()}
+        try:
+            names = [e.name for e in os.scandir(out_dir) if e.is_dir() and not e.name.startswith(".")]
+        except FileNotFoundError:
+            names = []
+        rows = [
+            {
+                "envelope_id": name,
+                "agreement_json": str(out_dir / name / "agreement.json"),
+                "failures": hints.pop(name, {}).get("failures"),
+                "from_scan": True,
+            }
+            for name in names
+        ]
+        return rows + list(hints.values())
+
+    @staticmethod
+    def _looks_like_agreement(row: dict) -> bool:
+        """True if a scanned directory without ``agreement.json`` is a failed or partial export."""
+        agreement_dir = Path(row["agreement_json"]).parent
+        return bool(
+            row.get("failures")
+            or (agreement_dir / "documents").is_dir()
+            or (agreement_dir / "manifest.json").exists()
+        )
+
+    def _check_agreement(self, row: dict) -> Optional[tuple[list[VerifyIssue], int, int]]:
+        """Issues, files and bytes checked; None if ``row`` is a scanned non-agreement directory."""
+        envelope_id = row["envelope_id"]
+        agreement_json = Path(row["agreement_json"])
+        agreement_dir = agreement_json.parent
+        if row.get("from_scan") and not agreement_json.exists() and not self._looks_like_agreement(row):
+            return None  # e.g. columnar/ or a stray directory
+        try:
+            agreement = Agreement.model_validate_json(agreement_json.read_text(encoding="utf-8"))
+        except (OSError, ValidationError, ValueError) as e:
+            kind: IssueKind = "recorded_failure" if row.get("failures") else "invalid_agreement_json"
+            return [VerifyIssue(envelope_id=envelope_id, kind=kind, path=agreement_json, detail=str(e))], 0, 0
+
+        issues: list[VerifyIssue] = []
+        checked_bytes = 0
+        try:
+            manifest = {e.document_id: e for e in self.exporter.read_manifest(agreement_dir)}
+        except (OSError, ValueError) as e:
+            path = agreement_dir / "manifest.json"
+            return [VerifyIssue(envelope_id=envelope_id, kind="invalid_manifest", path=path, detail=str(e))], 0, 0
+        for doc in agreement.documents:
+            entry = manifest.get(doc.document_id)
+            if entry is None:
+                issues.append(
+                    VerifyIssue(
+                        envelope_id=envelope_id,
+                        kind="missing_document",
+                        document_id=doc.document_id,
+                        detail="no manifest entry",
+                    )
+                )
+                continue
+            file_issues, size = self._check_file(envelope_id, entry)
+            issues.extend(file_issues)
+            checked_bytes += size
+        return issues, len(manifest), checked_bytes
+
+    def verify(self, progress: Optional[ProgressCallback] = None) -> VerifyReport:
+        rows = self._candidates()
+        report = VerifyReport(out_dir=self.exporter.out_dir)
+        lock = threading.Lock()
+        done = 0
+
+        def run(row: dict) -> None:
+            nonlocal done
+            result = self._check_agreement(row)
+            with lock:
+                done += 1
+                if result is not None:
+                    issues, files, size = result
+                    report.issues.extend(issues)
+                    report.agreements_checked += 1
+                    report.files_checked += files
+                    report.bytes_checked += size
+                if progress:
+                    progress(done, len(rows), report.bytes_checked)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            # list() re-raises worker exceptions instead of dropping them
+            list(pool.map(run, rows))
+        report.issues.sort(key=lambda i: (i.envelope_id, i.document_id or ""))
+        return report
+
+
+def repair(service: AgreementDownloadService, report: VerifyReport) -> list[ExportedAgreement]:
+    """Re-fetch only what ``report`` flagged.
+
+    Envelope-level issues re-export the whole envelope; document-level issues re-download
+    just the affected documents and patch ``manifest.json``.
+    """
+    exporter = FilesystemExporter(report.out_dir)
+    by_envelope: dict[str, list[VerifyIssue]] = defaultdict(list)
+    for issue in report.issues:
+        by_envelope[issue.envelope_id].append(issue)
+    if not by_envelope:
+        return []
+
+    repaired: list[ExportedAgreement] = []
+    with service._http_scope() as http:
+        api = service._open_api(http)
+        rows = {str(r.get("envelopeId")): r for r in service.lookup_envelopes(api, list(by_envelope))}
+        for envelope_id, issues in by_envelope.items():
+            row = rows.get(envelope_id)
+            if row is None:
+                continue
+            doc_ids = {i.document_id for i in issues}
+            if None in doc_ids:
+                repaired.append(service.export_envelope(api, exporter, row))
+                continue
+
+            try:
+                result = exporter.load_exported(envelope_id)
+            except (OSError, ValueError):
+                # agreement.json or manifest.json became unreadable since verify ran
+                repaired.append(service.export_envelope(api, exporter, row))
+                continue
+            docs = [d for d in result.agreement.documents if d.document_id in doc_ids]
+            service.download_documents(api, exporter, result, docs)
+            result.downloaded_files = [m.path for m in result.manifest]
+            repaired.append(result)
+
+    exporter.merge_index(repaired)
+    return repaired
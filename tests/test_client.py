@@ -1,5 +1,6 @@
 import httpx
 import pytest
+import respx
 
 from docusign_agreements_downloader.client import DocuSignClient, ApiContext, ApiError, TransientApiError
 
@@ -18,3 +19,49 @@ def test_raise_for_status_fatal():
     resp = httpx.Response(400, request=req, text="bad")
     with pytest.raises(ApiError):
         c._raise_for_status(resp)
+
+
+@respx.mock
+def test_list_envelopes_include_and_envelope_ids():
+    route = respx.get("https://b/restapi/v2.1/accounts/a/envelopes").respond(200, json={"envelopes": []})
+    c = DocuSignClient(http=httpx.Client(), ctx=ApiContext(base_uri="https://b", account_id="a"), access_token="t")
+
+    c.list_envelopes(from_date="2026-01-01", to_date=None, status="completed", include=("documents", "recipients"))
+    params = route.calls.last.request.url.params
+    assert params["include"] == "documents,recipients"
+    assert params["from_date"] == "2026-01-01"
+
+    c.list_envelopes(from_date=None, to_date=None, status="any", envelope_ids=["e1", "e2"])
+    params = route.calls.last.request.url.params
+    assert params["envelope_ids"] == "e1,e2"
+    assert "from_date" not in params
+    assert "include" not in params
+
+
+def test_list_envelopes_requires_from_date_without_ids():
+    c = DocuSignClient(http=httpx.Client(), ctx=ApiContext(base_uri="https://b", account_id="a"), access_token="t")
+    with pytest.raises(ValueError):
+        c.list_envelopes(from_date=None, to_date=None, status="completed")
+
+
+@respx.mock
+def test_enrichment_endpoints_share_request_budget():
+    base = "https://b/restapi/v2.1/accounts/a/envelopes/e1"
+    recipients = respx.get(f"{base}/recipients").respond(200, json={"signers": []})
+    respx.get(f"{base}/custom_fields").respond(200, json={"textCustomFields": []})
+    respx.get(f"{base}/audit_events").respond(200, json={"auditEvents": []})
+    acquired = []
+    c = DocuSignClient(
+        http=httpx.Client(),
+        ctx=ApiContext(base_uri="https://b", account_id="a"),
+        access_token="t",
+        acquire_request=lambda: acquired.append(1),
+    )
+
+    c.list_envelope_recipients("e1", include_tabs=True)
+    assert recipients.calls.last.request.url.params["include_tabs"] == "true"
+    c.list_envelope_recipients("e1")
+    assert "include_tabs" not in recipients.calls.last.request.url.params
+    assert c.list_envelope_custom_fields("e1") == {"textCustomFields": []}
+    assert c.list_envelope_audit_events("e1") == {"auditEvents": []}
+    assert len(acquired) == 4
@@ -0,0 +1,179 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+
+import pytest
+import respx
+from typer.testing import CliRunner
+
+from docusign_agreements_downloader import service as service_mod
+from docusign_agreements_downloader.cli import app
+from docusign_agreements_downloader.columnar import ColumnarExporter, partition_date
+from docusign_agreements_downloader.config import Settings
+from docusign_agreements_downloader.models import (
+    Agreement,
+    DocumentInfo,
+    EnvelopeSummary,
+    ExportedAgreement,
+    FailureRecord,
+    FileManifest,
+    OAuthToken,
+)
+from docusign_agreements_downloader.service import AgreementDownloadService
+
+ds = pytest.importorskip("pyarrow.dataset")
+
+
+def _exported(tmp_path: Path, env_id: str, day: int | None) -> ExportedAgreement:
+    completed = datetime(2026, 1, day, 12, tzinfo=timezone.utc) if day else None
+    agreement = Agreement(
+        envelope=EnvelopeSummary(envelope_id=env_id, status="completed", completed_date_time=completed),
+        documents=[DocumentInfo(document_id="1", name="A"), DocumentInfo(document_id="2", name="B")],
+        custom_fields={"textCustomFields": [{"name": "po", "value": "42"}]},
+    )
+    return ExportedAgreement(
+        agreement=agreement,
+        agreement_dir=tmp_path / env_id,
+        agreement_json_path=tmp_path / env_id / "agreement.json",
+        documents_dir=tmp_path / env_id / "documents",
+        manifest=[FileManifest(document_id="1", path=tmp_path / env_id / "documents" / "1_A.pdf", size=4, sha256="ab")],
+        failure_records=[
+            FailureRecord(
+                envelope_id=env_id,
+                document_id="2",
+                endpoint="GET /x",
+                http_status=404,
+                exception_class="docusign_agreements_downloader.ApiError",
+                message="gone",
+                failed_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+            )
+        ],
+    )
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_exporter_partitions_by_date(tmp_path: Path, fmt: str):
+    out = tmp_path / "out"
+    # tiny groups and one open file force several row groups and part files per partition
+    with ColumnarExporter(out, fmt, rows_per_group=2, max_buffered_rows=3, max_open_files=1) as tables:
+        for i in range(7):
+            exported = _exported(tmp_path, f"e{i}", day=None if i == 6 else 1 + i % 3)
+            if i == 0:
+                exported.failure_records.append(
+                    FailureRecord(
+                        envelope_id="e0",
+                        component="audit_events",
+                        http_status=400,
+                        exception_class="docusign_agreements_downloader.ApiError",
+                        message="bad",
+                        failed_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+                    )
+                )
+            tables.add(exported)
+
+    assert tables.files
+    assert not list(out.rglob("*.inprogress"))
+    assert {p.parent.name for p in (out / "columnar" / "envelopes").glob("*/*")} == {
+        "date=2026-01-01",
+        "date=2026-01-02",
+        "date=2026-01-03",
+        "date=unknown",
+    }
+
+    fmt_name = "ipc" if fmt == "arrow" else fmt
+    envelopes = ds.dataset(out / "columnar" / "envelopes", format=fmt_name, partitioning="hive").to_table()
+    assert envelopes.num_rows == 7
+    assert sorted(envelopes.column("envelope_id").to_pylist()) == [f"e{i}" for i in range(7)]
+    assert set(envelopes.column("downloaded_count").to_pylist()) == {1}
+
+    documents = ds.dataset(out / "columnar" / "documents", format=fmt_name, partitioning="hive").to_table()
+    assert documents.num_rows == 14
+    downloaded = documents.filter(ds.field("downloaded")).to_pylist()
+    assert {r["sha256"] for r in downloaded} == {"ab"}
+
+    failures = ds.dataset(out / "columnar" / "failures", format=fmt_name, partitioning="hive").to_table()
+    assert failures.column("failure_class").to_pylist() == ["client_error"] * 8
+    enrichment = failures.filter(ds.field("component") == "audit_events").to_pylist()
+    assert [(r["envelope_id"], r["document_id"]) for r in enrichment] == [("e0", None)]
+    assert failures.filter(ds.field("component").is_null()).num_rows == 7
+
+
+def test_partition_date_uses_utc_completed_then_created(tmp_path: Path):
+    e = _exported(tmp_path, "e1", day=None)
+    assert partition_date(e) == "unknown"
+    e.agreement.envelope.created_date_time = datetime.fromisoformat("2026-01-31T23:30:00-05:00")
+    assert partition_date(e) == "2026-02-01"
+
+
+def test_columnar_exporter_rejects_unknown_format(tmp_path: Path):
+    with pytest.raises(ValueError):
+        ColumnarExporter(tmp_path, "csv")
+
+
+def test_cli_columnar_without_pyarrow_is_a_usage_error(tmp_path: Path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    args = ["download", "--from-date", "2026-01-01T00:00:00Z", "--out", str(tmp_path / "out")]
+
+    result = CliRunner().invoke(app, [*args, "--columnar", "parquet"])
+    assert result.exit_code == 2
+    assert "needs pyarrow" in result.stderr
+
+    k = tmp_path / "k.pem"
+    k.write_text("unused", encoding="utf-8")
+    for name, value in {
+        "DS_AUTH_SERVER": "https://account-d.docusign.com",
+        "DS_INTEGRATION_KEY": "INTEGRATION_KEY_12345",
+        "DS_USER_ID": "USER_GUID_12345",
+        "DS_PRIVATE_KEY_PEM_PATH": str(k),
+        "DS_COLUMNAR_FORMAT": "arrow",
+    }.items():
+        monkeypatch.setenv(name, value)
+    result = CliRunner().invoke(app, args)
+    assert result.exit_code == 2
+    assert "Columnar output (arrow) needs pyarrow" in result.stderr
+    assert not (tmp_path / "out").exists()
+
+
+@respx.mock
+def test_service_download_writes_columnar_tables(tmp_path: Path, monkeypatch):
+    k = tmp_path / "k.pem"
+    k.write_text("unused", encoding="utf-8")
+    monkeypatch.setattr(
+        service_mod, "fetch_access_token", lambda s, h: OAuthToken(access_token="tok", expires_in=3600)
+    )
+    respx.get("https://account-d.docusign.com/oauth/userinfo").respond(
+        200, json={"accounts": [{"account_id": "acc", "base_uri": "https://demo.docusign.net", "is_default": True}]}
+    )
+    s = Settings(
+        auth_server="https://account-d.docusign.com",
+        integration_key="INTEGRATION_KEY_12345",
+        user_id="USER_GUID_12345",
+        private_key_pem_path=k,
+        columnar_format="parquet",
+    )
+    out = tmp_path / "out"
+    base = "https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes"
+    respx.get(base).respond(
+        200,
+        json={
+            "envelopes": [
+                {
+                    "envelopeId": "e1",
+                    "status": "completed",
+                    "completedDateTime": "2026-01-05T10:00:00Z",
+                    "envelopeDocuments": [{"documentId": "1", "name": "A"}],
+                }
+            ]
+        },
+    )
+    respx.get(f"{base}/e1/documents/1").respond(200, headers={"content-type": "application/pdf"}, content=b"%PDF")
+
+    result = AgreementDownloadService(s).download(
+        out_dir=out, from_date="2026-01-01T00:00:00Z", to_date=None, status="completed"
+    )
+
+    assert result.status == "ok"
+    documents = ds.dataset(out / "columnar" / "documents", format="parquet", partitioning="hive").to_table()
+    [row] = documents.to_pylist()
+    assert row["size"] == 4 and row["path"].endswith("1_A.pdf")
+    assert str(row["date"]) == "2026-01-05"
@@ -0,0 +1,195 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import http.client
+import json
+import threading
+
+import httpx
+import pytest
+import respx
+
+from docusign_agreements_downloader.client import ApiContext, ApiError, DocuSignClient
+from docusign_agreements_downloader.config import Settings
+from docusign_agreements_downloader.connect import (
+    ConnectQueue,
+    ConnectWorkerPool,
+    completed_envelope_id,
+    compute_hmac_signature,
+    make_connect_server,
+    verify_hmac,
+)
+from docusign_agreements_downloader.exporter import FilesystemExporter
+from docusign_agreements_downloader.service import AgreementDownloadService
+
+COMPLETED_EVENT = {
+    "event": "envelope-completed",
+    "apiVersion": "v2.1",
+    "data": {"accountId": "acc", "envelopeId": "e1", "envelopeSummary": {"status": "completed"}},
+}
+
+
+def _settings(tmp_path: Path) -> Settings:
+    k = tmp_path / "k.pem"
+    k.write_text("unused", encoding="utf-8")
+    return Settings(
+        auth_server="https://account-d.docusign.com",
+        integration_key="INTEGRATION_KEY_12345",
+        user_id="USER_GUID_12345",
+        private_key_pem_path=k,
+    )
+
+
+def test_hmac_roundtrip():
+    body = json.dumps(COMPLETED_EVENT).encode()
+    sig = compute_hmac_signature("secret", body)
+    assert verify_hmac("secret", body, ["other", sig])
+    assert not verify_hmac("secret", body + b" ", [sig])
+    assert not verify_hmac("secret", body, [])
+
+
+def test_completed_envelope_id():
+    assert completed_envelope_id(COMPLETED_EVENT) == "e1"
+    assert completed_envelope_id({"event": "envelope-sent", "data": {"envelopeId": "e2"}}) is None
+    assert completed_envelope_id({"event": "envelope-completed", "data": {}}) is None
+
+
+def test_queue_dedup_and_retry(tmp_path: Path):
+    q = ConnectQueue(tmp_path / "q.sqlite3", max_attempts=2)
+    assert q.enqueue("e1")
+    assert not q.enqueue("e1")
+    assert q.claim(10) == ["e1"]
+    assert q.claim(10) == []
+
+    q.mark_failed("e1", "boom")
+    assert q.counts() == {"pending": 1}
+    assert q.claim(10) == ["e1"]
+    q.mark_failed("e1", "boom")
+    assert q.counts() == {"failed": 1}
+
+    q.enqueue("e2")
+    q.claim(10)
+    assert q.requeue_in_progress() == 1
+    q.close()
+
+    reopened = ConnectQueue(tmp_path / "q.sqlite3")
+    assert reopened.counts() == {"failed": 1, "pending": 1}
+    reopened.close()
+
+
+def test_server_accepts_signed_payloads(tmp_path: Path):
+    q = ConnectQueue(tmp_path / "q.sqlite3")
+    server = make_connect_server("127.0.0.1", 0, q, hmac_key="secret")
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    body = json.dumps(COMPLETED_EVENT).encode()
+    try:
+        with httpx.Client() as c:
+            ok = c.post(url, content=body, headers={"X-DocuSign-Signature-1": compute_hmac_signature("secret", body)})
+            assert ok.status_code == 200
+            assert ok.json() == {"envelope_id": "e1", "queued": True}
+
+            dup = c.post(url, content=body, headers={"X-DocuSign-Signature-1": compute_hmac_signature("secret", body)})
+            assert dup.json()["queued"] is False
+
+            bad = c.post(url, content=body, headers={"X-DocuSign-Signature-1": "nope"})
+            assert bad.status_code == 401
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert q.counts() == {"pending": 1}
+    q.close()
+
+
+def test_server_requires_hmac_and_validates_length(tmp_path: Path):
+    q = ConnectQueue(tmp_path / "q.sqlite3")
+    with pytest.raises(ValueError):
+        make_connect_server("127.0.0.1", 0, q, hmac_key=None)
+    server = make_connect_server("127.0.0.1", 0, q, hmac_key=None, insecure_no_hmac=True, max_body_bytes=4096)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    port = server.server_address[1]
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.putrequest("POST", "/")
+        conn.putheader("Content-Length", "abc")
+        conn.endheaders()
+        assert conn.getresponse().status == 411
+        conn.close()
+
+        with httpx.Client() as c:
+            big = c.post(f"http://127.0.0.1:{port}/", content=b"x" * 4097)
+            assert big.status_code == 413
+            unsigned = c.post(f"http://127.0.0.1:{port}/", content=json.dumps(COMPLETED_EVENT).encode())
+            assert unsigned.json()["queued"] is True
+    finally:
+        server.shutdown()
+        server.server_close()
+    q.close()
+
+
+@respx.mock
+def test_worker_drains_batch(tmp_path: Path):
+    listing = respx.get("https://b/restapi/v2.1/accounts/a/envelopes").respond(
+        200,
+        json={
+            "envelopes": [
+                {"envelopeId": "e1", "status": "completed", "envelopeDocuments": [{"documentId": "1", "name": "A"}]},
+                {"envelopeId": "e2", "status": "completed", "envelopeDocuments": [{"documentId": "1", "name": "B"}]},
+            ]
+        },
+    )
+    respx.get("https://b/restapi/v2.1/accounts/a/envelopes/e1/documents/1").respond(
+        200, headers={"content-type": "application/pdf"}, content=b"%PDF"
+    )
+    respx.get("https://b/restapi/v2.1/accounts/a/envelopes/e2/documents/1").respond(404, text="gone")
+
+    q = ConnectQueue(tmp_path / "q.sqlite3")
+    q.enqueue("e1")
+    q.enqueue("e2")
+    q.enqueue("missing")
+    out = tmp_path / "out"
+    pool = ConnectWorkerPool(AgreementDownloadService(_settings(tmp_path)), q, out)
+    api = DocuSignClient(http=httpx.Client(), ctx=ApiContext(base_uri="https://b", account_id="a"), access_token="t")
+
+    assert pool.drain_once(api) == 3
+    assert listing.calls.last.request.url.params["envelope_ids"] == "e1,e2,missing"
+    # a failed document is left to retry-failures instead of re-queueing the whole envelope
+    assert q.counts() == {"done": 2, "pending": 1}
+    assert (out / "e1" / "documents" / "1_A.pdf").read_bytes() == b"%PDF"
+    index = json.loads((out / "index.json").read_text(encoding="utf-8"))
+    assert [r["envelope_id"] for r in index] == ["e1", "e2"]
+    records = sorted(FilesystemExporter(out).read_failures(), key=lambda r: r.envelope_id)
+    assert [(r.envelope_id, r.level, r.exception_class) for r in records] == [
+        ("e2", "document", "docusign_agreements_downloader.ApiError"),
+        ("missing", "envelope", "LookupError"),
+    ]
+    q.close()
+
+
+@respx.mock
+def test_sweep_resumes_from_last_successful_sweep(tmp_path: Path):
+    listing = respx.get("https://b/restapi/v2.1/accounts/a/envelopes").mock(
+        side_effect=[
+            httpx.Response(200, json={"envelopes": [{"envelopeId": "e1", "status": "completed"}]}),
+            httpx.Response(400, text="bad request"),
+        ]
+    )
+    q = ConnectQueue(tmp_path / "q.sqlite3")
+    assert q.last_sweep() is None
+    down_since = datetime(2026, 1, 1, tzinfo=timezone.utc)  # receiver was down far longer than one interval
+    q.set_last_sweep(down_since)
+    pool = ConnectWorkerPool(AgreementDownloadService(_settings(tmp_path)), q, tmp_path / "out", sweep_interval_s=60)
+    api = DocuSignClient(http=httpx.Client(), ctx=ApiContext(base_uri="https://b", account_id="a"), access_token="t")
+
+    assert pool.sweep_since_last(api) == 1
+    assert listing.calls.last.request.url.params["from_date"] == "2026-01-01T00:00:00Z"
+    advanced = q.last_sweep()
+    assert advanced is not None and advanced > down_since
+
+    with pytest.raises(ApiError):
+        pool.sweep_since_last(api)
+    q.close()
+    reopened = ConnectQueue(tmp_path / "q.sqlite3")
+    assert reopened.last_sweep() == advanced  # a failed sweep keeps the mark
+    reopened.close()
@@ -0,0 +1,129 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+
+import pytest
+from typer.testing import CliRunner
+
+from docusign_agreements_downloader.cli import app
+from docusign_agreements_downloader.daemon import (
+    DaemonError,
+    DaemonUnavailable,
+    daemon_available,
+    make_daemon_server,
+    send_job,
+)
+from docusign_agreements_downloader.models import DownloadResult
+
+runner = CliRunner()
+
+
+class FakeService:
+    def __init__(self):
+        self.calls = []
+
+    def download(self, out_dir, from_date, to_date, status, page_size, **kwargs):
+        self.calls.append((out_dir, from_date, to_date, status, page_size))
+        now = datetime(2026, 1, 31, tzinfo=timezone.utc)
+        return DownloadResult(
+            out_dir=out_dir, failures=["Envelope e1 failed: boom"], started_at=now, finished_at=now, status="failed"
+        )
+
+
+@pytest.fixture
+def daemon():
+    # AF_UNIX paths are limited to ~100 bytes, so avoid the long pytest tmp_path
+    sock = Path(tempfile.mkdtemp(dir="/tmp")) / "d.sock"
+    svc = FakeService()
+    server = make_daemon_server(sock, svc)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    yield sock, svc
+    server.shutdown()
+    server.server_close()
+
+
+def test_send_job_roundtrip(daemon):
+    sock, svc = daemon
+    assert daemon_available(sock)
+    reply = send_job(
+        sock, "download", {"out": "/x", "from_date": "d", "to_date": None, "status": "completed", "page_size": 10}
+    )
+    assert reply["summary"]["status"] == "failed"
+    assert reply["failures"] == ["Envelope e1 failed: boom"]
+    assert svc.calls == [(Path("/x"), "d", None, "completed", 10)]
+
+    with pytest.raises(DaemonError, match="unknown command"):
+        send_job(sock, "nope", {})
+
+
+def test_probe_is_not_logged_as_failed_job(daemon, caplog):
+    sock, svc = daemon
+    with caplog.at_level("ERROR"):
+        assert daemon_available(sock)
+        send_job(sock, "download", {"out": "/x", "from_date": "d", "to_date": None, "status": "s", "page_size": 1})
+    assert not [r for r in caplog.records if r.name.startswith("docusign_agreements_downloader")]
+    assert len(svc.calls) == 1
+
+
+def test_send_job_without_daemon_is_unavailable():
+    with pytest.raises(DaemonUnavailable):
+        send_job(Path(tempfile.mkdtemp(dir="/tmp")) / "none.sock", "download", {})
+
+
+@pytest.mark.parametrize("error", [PermissionError(13, "Permission denied"), ConnectionResetError(104, "reset")])
+def test_send_job_unreachable_daemon_is_unavailable(monkeypatch, error):
+    def connect(self, address):
+        raise error
+
+    monkeypatch.setattr(socket.socket, "connect", connect)
+    with pytest.raises(DaemonUnavailable):
+        send_job(Path("/tmp/dsa.sock"), "download", {})
+
+
+def test_second_daemon_on_same_socket_is_refused(daemon):
+    sock, _ = daemon
+    with pytest.raises(DaemonError, match="already listening"):
+        make_daemon_server(sock, FakeService())
+
+
+def test_cli_forwards_to_daemon(daemon, tmp_path: Path):
+    sock, svc = daemon
+    result = runner.invoke(
+        app,
+        ["download", "--from-date", "2026-01-01T00:00:00Z", "--out", str(tmp_path / "out"), "--daemon-socket", str(sock)],
+    )
+    assert result.exit_code == 1
+    assert '"status": "failed"' in result.stdout
+    assert svc.calls[0][0] == (tmp_path / "out").resolve()
+
+
+def test_cli_reports_failed_daemon_job(tmp_path: Path):
+    class BrokenService(FakeService):
+        def download(self, *args, **kwargs):
+            raise RuntimeError("disk full")
+
+    sock = Path(tempfile.mkdtemp(dir="/tmp")) / "d.sock"
+    server = make_daemon_server(sock, BrokenService())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        result = runner.invoke(
+            app, ["download", "--from-date", "2026-01-01T00:00:00Z", "--out", str(tmp_path), "--daemon-socket", str(sock)]
+        )
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert result.exit_code == 1
+    assert "error: RuntimeError: disk full" in result.stderr
+    assert "Traceback" not in result.output
+
+
+def test_cli_import_is_light():
+    heavy = ("httpx", "pydantic", "pydantic_settings", "jwt", "cryptography", "tenacity")
+    code = f"import sys, docusign_agreements_downloader.cli; print([m for m in {heavy!r} if m in sys.modules])"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
@@ -0,0 +1,48 @@
+import pytest
+
+from docusign_agreements_downloader.enrichment import (
+    flatten_audit_events,
+    parse_enrichments,
+    recipient_tabs,
+    without_tabs,
+)
+
+
+def test_parse_enrichments_normalises_and_orders():
+    assert parse_enrichments("tabs, Recipients,tabs") == ("recipients", "tabs")
+    assert parse_enrichments(["audit_events", "certificate,custom_fields"]) == (
+        "custom_fields",
+        "audit_events",
+        "certificate",
+    )
+    assert parse_enrichments("") == ()
+    assert parse_enrichments(None) == ()
+    with pytest.raises(ValueError, match="bogus"):
+        parse_enrichments("recipients,bogus")
+
+
+def test_recipient_tabs_and_without_tabs():
+    payload = {
+        "signers": [
+            {"recipientId": "1", "email": "a@x", "tabs": {"textTabs": [{"tabLabel": "po", "value": "42"}]}},
+            {"recipientId": "2", "email": "b@x"},
+        ],
+        "carbonCopies": [{"recipientId": "3", "email": "c@x"}],
+        "recipientCount": "3",
+    }
+    assert recipient_tabs(payload) == {"1": {"textTabs": [{"tabLabel": "po", "value": "42"}]}}
+    stripped = without_tabs(payload)
+    assert "tabs" not in stripped["signers"][0]
+    assert stripped["recipientCount"] == "3"
+    assert "tabs" in payload["signers"][0]
+
+
+def test_flatten_audit_events():
+    payload = {
+        "auditEvents": [
+            {"eventFields": [{"name": "Action", "value": "Sent"}, {"name": "UserName", "value": "Ann"}]},
+            {"eventFields": [{"name": "Action", "value": "Signed"}]},
+        ]
+    }
+    assert flatten_audit_events(payload) == [{"Action": "Sent", "UserName": "Ann"}, {"Action": "Signed"}]
+    assert flatten_audit_events(None) == []
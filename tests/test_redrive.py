@@ -0,0 +1,204 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import json
+
+import httpx
+import respx
+
+from docusign_agreements_downloader import service as service_mod
+from docusign_agreements_downloader.config import Settings
+from docusign_agreements_downloader.exporter import FilesystemExporter
+from docusign_agreements_downloader.models import (
+    Agreement,
+    DocumentInfo,
+    EnvelopeSummary,
+    FailureRecord,
+    OAuthToken,
+)
+from docusign_agreements_downloader.redrive import FailureRedriver
+from docusign_agreements_downloader.service import AgreementDownloadService
+
+BASE = "https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes"
+NOW = datetime(2026, 1, 31, tzinfo=timezone.utc)
+
+
+def _service(tmp_path: Path, monkeypatch) -> AgreementDownloadService:
+    k = tmp_path / "k.pem"
+    k.write_text("unused", encoding="utf-8")
+    monkeypatch.setattr(
+        service_mod, "fetch_access_token", lambda s, h: OAuthToken(access_token="tok", expires_in=3600)
+    )
+    respx.get("https://account-d.docusign.com/oauth/userinfo").respond(
+        200, json={"accounts": [{"account_id": "acc", "base_uri": "https://demo.docusign.net", "is_default": True}]}
+    )
+    return AgreementDownloadService(
+        Settings(
+            auth_server="https://account-d.docusign.com",
+            integration_key="INTEGRATION_KEY_12345",
+            user_id="USER_GUID_12345",
+            private_key_pem_path=k,
+        )
+    )
+
+
+def _seed(out: Path) -> FilesystemExporter:
+    """e1 failed at envelope level; e2 was exported but its document 2 failed."""
+    exporter = FilesystemExporter(out)
+    _, _, agreement_json = exporter.prepare_agreement_dirs("e2")
+    exporter.write_agreement_json(
+        Agreement(
+            envelope=EnvelopeSummary(envelope_id="e2", status="completed"),
+            documents=[DocumentInfo(document_id="1", name="A"), DocumentInfo(document_id="2", name="B")],
+        ),
+        agreement_json,
+    )
+    exporter.update_failures(
+        [
+            FailureRecord(envelope_id="e1", http_status=503, exception_class="x.TransientApiError", message="m", failed_at=NOW),
+            FailureRecord(envelope_id="e2", document_id="2", exception_class="httpx.ReadTimeout", message="m", failed_at=NOW),
+        ],
+        resolved=set(),
+    )
+    return exporter
+
+
+@respx.mock
+def test_redrive_targets_only_failed_items(tmp_path: Path, monkeypatch):
+    out = tmp_path / "out"
+    exporter = _seed(out)
+    svc = _service(tmp_path, monkeypatch)
+
+    listing = respx.get(BASE).respond(
+        200,
+        json={"envelopes": [{"envelopeId": "e1", "status": "completed", "envelopeDocuments": [{"documentId": "9", "name": "Z"}]}]},
+    )
+    respx.get(f"{BASE}/e1/documents/9").respond(200, headers={"content-type": "application/pdf"}, content=b"%PDF-9")
+    e2_doc1 = respx.get(f"{BASE}/e2/documents/1")
+    respx.get(f"{BASE}/e2/documents/2").respond(200, headers={"content-type": "application/pdf"}, content=b"%PDF-2")
+
+    result = FailureRedriver(svc, out, sleep=lambda s: None).run()
+
+    assert result.attempted == 2 and result.resolved == 2
+    assert result.by_class == {"transport": 1, "server_error": 1}
+    assert result.still_failing == []
+    assert listing.calls.last.request.url.params["envelope_ids"] == "e1"
+    assert not e2_doc1.called
+    assert exporter.read_failures() == []
+    assert [m.document_id for m in exporter.read_manifest(out / "e2")] == ["2"]
+    index = {r["envelope_id"] for r in json.loads((out / "index.json").read_text(encoding="utf-8"))}
+    assert index == {"e1", "e2"}
+
+
+@respx.mock
+def test_redrive_counts_attempts_and_backs_off(tmp_path: Path, monkeypatch):
+    out = tmp_path / "out"
+    exporter = _seed(out)
+    svc = _service(tmp_path, monkeypatch)
+    respx.get(f"{BASE}/e2/documents/2").respond(404, text="gone")
+    sleeps: list[float] = []
+
+    result = FailureRedriver(svc, out, rounds=3, max_attempts=10, backoff_s=1.0, sleep=sleeps.append).run(
+        classes={"transport"}
+    )
+
+    assert result.skipped == 1
+    assert sleeps == [1.0, 2.0]
+    [record] = result.still_failing
+    assert (record.document_id, record.attempts, record.http_status) == ("2", 4, 404)
+    assert {r.envelope_id for r in exporter.read_failures()} == {"e1", "e2"}
+
+
+@respx.mock
+def test_redrive_falls_back_to_export_when_agreement_json_is_missing(tmp_path: Path, monkeypatch):
+    out = tmp_path / "out"
+    exporter = _seed(out)
+    (out / "e2" / "agreement.json").unlink()
+    svc = _service(tmp_path, monkeypatch)
+    respx.get(BASE).respond(
+        200,
+        json={
+            "envelopes": [
+                {"envelopeId": "e1", "status": "completed", "envelopeDocuments": []},
+                {"envelopeId": "e2", "status": "completed", "envelopeDocuments": [{"documentId": "2", "name": "B"}]},
+            ]
+        },
+    )
+    respx.get(f"{BASE}/e2/documents/2").respond(200, headers={"content-type": "application/pdf"}, content=b"%PDF-2")
+
+    result = FailureRedriver(svc, out, rounds=2, sleep=lambda s: None).run()
+
+    assert result.still_failing == []
+    assert exporter.read_failures() == []
+    assert [m.document_id for m in exporter.read_manifest(out / "e2")] == ["2"]
+
+
+@respx.mock
+def test_redrive_reruns_only_the_failed_enrichment(tmp_path: Path, monkeypatch):
+    out = tmp_path / "out"
+    svc = _service(tmp_path, monkeypatch)
+    svc.settings = svc.settings.model_copy(update={"enrich": "audit_events"})
+    respx.get(BASE).respond(
+        200,
+        json={"envelopes": [{"envelopeId": "e1", "status": "completed", "envelopeDocuments": [{"documentId": "1", "name": "A"}]}]},
+    )
+    doc = respx.get(f"{BASE}/e1/documents/1").respond(200, headers={"content-type": "application/pdf"}, content=b"%PDF")
+    audit = respx.get(f"{BASE}/e1/audit_events").mock(
+        side_effect=[
+            httpx.Response(400, text="bad"),
+            httpx.Response(200, json={"auditEvents": [{"eventFields": [{"name": "Action", "value": "Signed"}]}]}),
+        ]
+    )
+    svc.download(out_dir=out, from_date="2026-01-01T00:00:00Z", to_date=None, status="completed")
+    [record] = FilesystemExporter(out).read_failures()
+    assert (record.level, record.component, record.enrich) == ("enrichment", "audit_events", ["audit_events"])
+
+    # the CLI --with is not re-read: the redriver uses the enrichment set recorded at export time
+    svc.settings = svc.settings.model_copy(update={"enrich": ""})
+    result = FailureRedriver(svc, out, sleep=lambda s: None).run()
+
+    assert result.resolved == 1 and result.still_failing == []
+    assert audit.call_count == 2 and doc.call_count == 1
+    agreement = json.loads((out / "e1" / "agreement.json").read_text(encoding="utf-8"))
+    assert agreement["audit_events"] == [{"Action": "Signed"}]
+    assert [d["document_id"] for d in agreement["documents"]] == ["1"]
+
+
+@respx.mock
+def test_redrive_reexport_keeps_recorded_enrichments(tmp_path: Path, monkeypatch):
+    out = tmp_path / "out"
+    out.mkdir()
+    exporter = FilesystemExporter(out)
+    exporter.update_failures(
+        [
+            FailureRecord(
+                envelope_id="e1",
+                http_status=503,
+                exception_class="x.TransientApiError",
+                message="m",
+                failed_at=NOW,
+                enrich=["custom_fields"],
+            )
+        ],
+        resolved=set(),
+    )
+    svc = _service(tmp_path, monkeypatch)
+    respx.get(BASE).respond(
+        200,
+        json={
+            "envelopes": [
+                {
+                    "envelopeId": "e1",
+                    "status": "completed",
+                    "envelopeDocuments": [],
+                    "customFields": {"textCustomFields": [{"name": "Deal", "value": "42"}]},
+                }
+            ]
+        },
+    )
+
+    result = FailureRedriver(svc, out, sleep=lambda s: None).run()
+
+    assert result.still_failing == []
+    agreement = exporter.load_exported("e1").agreement
+    assert agreement.enrichments == ["custom_fields"]
+    assert agreement.custom_fields == {"textCustomFields": [{"name": "Deal", "value": "42"}]}
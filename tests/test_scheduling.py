@@ -0,0 +1,124 @@
+from pathlib import Path
+import random
+
+import pytest
+import respx
+
+from docusign_agreements_downloader import service as service_mod
+from docusign_agreements_downloader.config import Settings
+from docusign_agreements_downloader.models import OAuthToken
+from docusign_agreements_downloader.scheduling import (
+    SpillingPriorityQueue,
+    by_sender,
+    make_policy,
+    newest_first,
+    oldest_first,
+    smallest_first,
+)
+from docusign_agreements_downloader.service import AgreementDownloadService
+
+
+def _row(env_id: str, completed: str | None = None, sender: str | None = None, docs=None) -> dict:
+    row = {"envelopeId": env_id, "status": "completed"}
+    if completed:
+        row["completedDateTime"] = completed
+    if sender:
+        row["senderEmail"] = sender
+    if docs is not None:
+        row["envelopeDocuments"] = docs
+    return row
+
+
+def test_policies_order_rows():
+    rows = [
+        _row("a", "2026-01-02T00:00:00Z", "x@e.com", [{"documentId": "1", "sizeBytes": 500}]),
+        _row("b", "2026-01-03T00:00:00Z", "boss@e.com", [{"documentId": "1", "sizeBytes": 10}]),
+        _row("c", None, "BOSS@e.com", [{"documentId": "1"}]),
+        _row("d", "2026-01-01T00:00:00Z", None, [{"documentId": "1", "pages": "1"}]),
+    ]
+
+    def order(policy):
+        return [r["envelopeId"] for r in sorted(rows, key=policy)]
+
+    assert order(newest_first) == ["b", "a", "d", "c"]
+    assert order(oldest_first) == ["d", "a", "b", "c"]
+    assert order(by_sender(["boss@e.com"])) == ["b", "c", "a", "d"]
+    assert order(smallest_first) == ["b", "a", "d", "c"]
+
+
+def test_make_policy():
+    assert make_policy("listing") is None
+    assert make_policy("newest") is newest_first
+    with pytest.raises(ValueError):
+        make_policy("sender")
+    with pytest.raises(ValueError):
+        make_policy("bogus")
+
+
+def test_spilling_queue_is_exact_and_bounded(tmp_path: Path):
+    rng = random.Random(7)
+    values = [rng.randrange(1000) for _ in range(500)]
+    with SpillingPriorityQueue(lambda r: (float(r["v"]),), max_in_memory=16, spill_dir=tmp_path) as q:
+        for i, v in enumerate(values):
+            q.push({"i": i, "v": v})
+            assert len(q._heap) < 16
+        assert q.spilled_runs > 0
+        out = list(q.drain())
+    # ties keep insertion order
+    assert [(r["v"], r["i"]) for r in out] == sorted((v, i) for i, v in enumerate(values))
+    assert list(tmp_path.iterdir()) == []
+
+
+@respx.mock
+def test_download_follows_priority(tmp_path: Path, monkeypatch):
+    k = tmp_path / "k.pem"
+    k.write_text("unused", encoding="utf-8")
+    monkeypatch.setattr(
+        service_mod, "fetch_access_token", lambda s, h: OAuthToken(access_token="tok", expires_in=3600)
+    )
+    respx.get("https://account-d.docusign.com/oauth/userinfo").respond(
+        200, json={"accounts": [{"account_id": "acc", "base_uri": "https://demo.docusign.net", "is_default": True}]}
+    )
+    respx.get("https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes").respond(
+        200,
+        json={
+            "envelopes": [
+                _row(f"e{i}", f"2026-01-0{i}T00:00:00Z", docs=[]) for i in range(1, 6)
+            ]
+        },
+    )
+    svc = AgreementDownloadService(
+        Settings(
+            auth_server="https://account-d.docusign.com",
+            integration_key="INTEGRATION_KEY_12345",
+            user_id="USER_GUID_12345",
+            private_key_pem_path=k,
+        )
+    )
+
+    result = svc.download(
+        out_dir=tmp_path / "out",
+        from_date="2026-01-01T00:00:00Z",
+        to_date=None,
+        status="completed",
+        page_size=2,
+        priority=newest_first,
+        max_in_memory=2,
+    )
+
+    assert [e.agreement.envelope.envelope_id for e in result.exported] == ["e5", "e4", "e3", "e2", "e1"]
+    assert not (tmp_path / "out" / ".spill").exists() or not any((tmp_path / "out" / ".spill").iterdir())
+
+
+def test_spilling_queue_caps_open_runs(tmp_path: Path):
+    rng = random.Random(11)
+    values = [rng.randrange(100) for _ in range(3000)]
+    with SpillingPriorityQueue(
+        lambda r: (float(r["v"]),), max_in_memory=2, spill_dir=tmp_path, max_open_runs=8
+    ) as q:
+        for i, v in enumerate(values):
+            q.push({"i": i, "v": v})
+            assert q.spilled_runs <= 8
+        out = list(q.drain())
+    assert [(r["v"], r["i"]) for r in out] == sorted((v, i) for i, v in enumerate(values))
+    assert list(tmp_path.iterdir()) == []
@@ -1,9 +1,13 @@
+import json
+import threading
 from pathlib import Path
 
 import httpx
 import respx
 
+from docusign_agreements_downloader import service as service_mod
 from docusign_agreements_downloader.config import Settings
+from docusign_agreements_downloader.models import OAuthToken
 from docusign_agreements_downloader.service import AgreementDownloadService
 
 
@@ -125,3 +129,328 @@ def test_service_records_failure_and_continues(tmp_path: Path):
     assert result.status in ("partial", "ok")
     assert len(result.exported) == 2
     assert len(result.failures) >= 1
+
+
+def _stub_auth(monkeypatch) -> None:
+    monkeypatch.setattr(
+        service_mod,
+        "fetch_access_token",
+        lambda settings, http: OAuthToken(access_token="tok", expires_in=3600),
+    )
+    respx.get("https://account-d.docusign.com/oauth/userinfo").respond(
+        200, json={"accounts":[{"account_id":"acc","base_uri":"https://demo.docusign.net","is_default":True}]}
+    )
+
+
+@respx.mock
+def test_service_uses_inlined_documents(tmp_path: Path, monkeypatch):
+    s = _settings(tmp_path)
+    out = tmp_path / "out"
+    _stub_auth(monkeypatch)
+
+    listing = respx.get("https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes").respond(
+        200,
+        json={
+            "resultSetSize": 1,
+            "totalSetSize": 1,
+            "envelopes":[
+                {
+                    "envelopeId":"e1",
+                    "status":"completed",
+                    "envelopeDocuments":[{"documentId":"1","name":"Agreement"}],
+                }
+            ],
+        },
+    )
+    docs_list = respx.get("https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes/e1/documents")
+    respx.get("https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes/e1/documents/1").respond(
+        200, headers={"content-type":"application/pdf"}, content=b"%PDF"
+    )
+
+    result = AgreementDownloadService(s).download(
+        out_dir=out, from_date="2026-01-01T00:00:00Z", to_date=None, status="completed"
+    )
+
+    assert result.status == "ok"
+    assert listing.calls.last.request.url.params["include"] == "documents"
+    assert not docs_list.called
+    assert result.exported[0].agreement.documents[0].name == "Agreement"
+
+
+@respx.mock
+def test_service_isolates_document_failures(tmp_path: Path, monkeypatch):
+    s = _settings(tmp_path)
+    out = tmp_path / "out"
+    _stub_auth(monkeypatch)
+
+    respx.get("https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes").respond(
+        200,
+        json={
+            "envelopes":[
+                {
+                    "envelopeId":"e1",
+                    "status":"completed",
+                    "envelopeDocuments":[{"documentId":"1","name":"A"},{"documentId":"2","name":"B"}],
+                }
+            ],
+        },
+    )
+    respx.get("https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes/e1/documents/1").respond(
+        200, headers={"content-type":"application/pdf"}, content=b"%PDF"
+    )
+    respx.get("https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes/e1/documents/2").respond(
+        404, text="gone"
+    )
+
+    result = AgreementDownloadService(s).download(
+        out_dir=out, from_date="2026-01-01T00:00:00Z", to_date=None, status="completed"
+    )
+
+    assert result.status == "partial"
+    assert len(result.exported[0].downloaded_files) == 1
+    [record] = result.failure_records
+    assert (record.envelope_id, record.document_id, record.http_status) == ("e1", "2", 404)
+    assert record.level == "document"
+    assert record.failure_class == "client_error"
+    assert record.endpoint == "GET /restapi/v2.1/accounts/acc/envelopes/e1/documents/2"
+    assert record.exception_class == "docusign_agreements_downloader.ApiError"
+    assert "e1" in (out / "failures.json").read_text(encoding="utf-8")
+
+
+@respx.mock
+def test_service_parallel_download_keeps_listing_order(tmp_path: Path, monkeypatch):
+    s = _settings(tmp_path).model_copy(update={"download_workers": 3, "bandwidth_bps": 10**9})
+    out = tmp_path / "out"
+    _stub_auth(monkeypatch)
+
+    envelopes = [
+        {"envelopeId": f"e{i}", "status": "completed", "envelopeDocuments": [{"documentId": "1", "name": "A"}]}
+        for i in range(5)
+    ]
+    respx.get("https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes").respond(
+        200, json={"envelopes": envelopes}
+    )
+    respx.get(url__regex=r"https://demo\.docusign\.net/.*/envelopes/e\d/documents/1").respond(
+        200, headers={"content-type":"application/pdf"}, content=b"%PDF"
+    )
+
+    result = AgreementDownloadService(s).download(
+        out_dir=out, from_date="2026-01-01T00:00:00Z", to_date=None, status="completed"
+    )
+
+    assert result.status == "ok"
+    assert [e.agreement.envelope.envelope_id for e in result.exported] == [f"e{i}" for i in range(5)]
+    assert all(len(e.manifest) == 1 for e in result.exported)
+
+
+@respx.mock
+def test_service_keep_warm_reuses_token(tmp_path: Path, monkeypatch):
+    s = _settings(tmp_path)
+    calls = []
+    monkeypatch.setattr(
+        service_mod,
+        "fetch_access_token",
+        lambda settings, http: calls.append(1) or OAuthToken(access_token="tok", expires_in=3600),
+    )
+    respx.get("https://account-d.docusign.com/oauth/userinfo").respond(
+        200, json={"accounts":[{"account_id":"acc","base_uri":"https://demo.docusign.net","is_default":True}]}
+    )
+    respx.get("https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes").respond(200, json={"envelopes": []})
+
+    svc = AgreementDownloadService(s)
+    svc.keep_warm()
+    try:
+        for _ in range(3):
+            svc.download(out_dir=tmp_path / "out", from_date="2026-01-01T00:00:00Z", to_date=None, status="completed")
+    finally:
+        svc.close()
+    assert len(calls) == 1
+
+
+@respx.mock
+def test_service_enrichment_written_to_agreement_json(tmp_path: Path, monkeypatch):
+    s = _settings(tmp_path).model_copy(update={"api_requests_per_s": 1000.0})
+    out = tmp_path / "out"
+    _stub_auth(monkeypatch)
+    base = "https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes"
+
+    listing = respx.get(base).respond(
+        200,
+        json={
+            "envelopes":[
+                {
+                    "envelopeId":"e1",
+                    "status":"completed",
+                    "envelopeDocuments":[{"documentId":"1","name":"A"}],
+                    "customFields":{"textCustomFields":[{"name":"po","value":"42"}]},
+                }
+            ],
+        },
+    )
+    recipients = respx.get(f"{base}/e1/recipients").respond(
+        200,
+        json={"signers":[{"recipientId":"1","email":"a@x","tabs":{"textTabs":[{"tabLabel":"t","value":"v"}]}}]},
+    )
+    custom_fields = respx.get(f"{base}/e1/custom_fields")
+    respx.get(f"{base}/e1/audit_events").respond(
+        200, json={"auditEvents":[{"eventFields":[{"name":"Action","value":"Signed"}]}]}
+    )
+    respx.get(url__regex=rf"{base}/e1/documents/(1|certificate)").respond(
+        200, headers={"content-type":"application/pdf"}, content=b"%PDF"
+    )
+
+    result = AgreementDownloadService(s).download(
+        out_dir=out,
+        from_date="2026-01-01T00:00:00Z",
+        to_date=None,
+        status="completed",
+        enrich=["recipients", "tabs", "custom_fields", "audit_events", "certificate"],
+    )
+
+    assert result.status == "ok"
+    assert listing.calls.last.request.url.params["include"] == "documents,recipients,custom_fields"
+    assert recipients.call_count == 1  # one request covers recipients and tabs
+    assert recipients.calls.last.request.url.params["include_tabs"] == "true"
+    assert not custom_fields.called  # inlined by the listing
+    agreement = result.exported[0].agreement
+    assert agreement.tabs == {"1": {"textTabs": [{"tabLabel": "t", "value": "v"}]}}
+    assert "tabs" not in agreement.recipients["signers"][0]
+    assert agreement.custom_fields == {"textCustomFields": [{"name": "po", "value": "42"}]}
+    assert agreement.audit_events == [{"Action": "Signed"}]
+    assert {m.document_id for m in result.exported[0].manifest} == {"1", "certificate"}
+    on_disk = json.loads((out / "e1" / "agreement.json").read_text(encoding="utf-8"))
+    assert on_disk["audit_events"] == [{"Action": "Signed"}]
+
+
+@respx.mock
+def test_service_enrichment_failure_is_recorded(tmp_path: Path, monkeypatch):
+    s = _settings(tmp_path).model_copy(update={"enrich": "audit_events"})
+    out = tmp_path / "out"
+    _stub_auth(monkeypatch)
+    base = "https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes"
+
+    respx.get(base).respond(
+        200,
+        json={"envelopes":[{"envelopeId":"e1","status":"completed","envelopeDocuments":[{"documentId":"1","name":"A"}]}]},
+    )
+    respx.get(f"{base}/e1/audit_events").respond(403, text="forbidden")
+    respx.get(f"{base}/e1/documents/1").respond(200, headers={"content-type":"application/pdf"}, content=b"%PDF")
+
+    result = AgreementDownloadService(s).download(
+        out_dir=out, from_date="2026-01-01T00:00:00Z", to_date=None, status="completed"
+    )
+
+    assert result.status == "partial"
+    assert len(result.exported[0].manifest) == 1
+    assert result.exported[0].agreement.audit_events is None
+    [record] = result.failure_records
+    assert (record.envelope_id, record.document_id, record.http_status) == ("e1", None, 403)
+    assert record.endpoint == "GET /restapi/v2.1/accounts/acc/envelopes/e1/audit_events"
+    assert (record.level, record.component, record.key) == ("enrichment", "audit_events", ("e1", "enrichment:audit_events"))
+
+
+@respx.mock
+def test_service_slow_envelope_does_not_stall_next_page(tmp_path: Path, monkeypatch):
+    s = _settings(tmp_path).model_copy(update={"download_workers": 3})
+    out = tmp_path / "out"
+    _stub_auth(monkeypatch)
+    base = "https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes"
+
+    def listing(request):
+        start = int(request.url.params.get("start_position", 0))
+        env = {"envelopeId": f"e{start}", "status": "completed", "envelopeDocuments": [{"documentId": "1", "name": "A"}]}
+        return httpx.Response(200, json={"resultSetSize": 1, "totalSetSize": 2, "envelopes": [env]})
+
+    second_page_done = threading.Event()
+
+    def slow_document(request):
+        # e0 only finishes once e1 (listed on the next page) has been downloaded
+        assert second_page_done.wait(5), "next page was not started while e0 was downloading"
+        return httpx.Response(200, headers={"content-type": "application/pdf"}, content=b"%PDF-0")
+
+    def fast_document(request):
+        second_page_done.set()
+        return httpx.Response(200, headers={"content-type": "application/pdf"}, content=b"%PDF-1")
+
+    respx.get(base).mock(side_effect=listing)
+    respx.get(f"{base}/e0/documents/1").mock(side_effect=slow_document)
+    respx.get(f"{base}/e1/documents/1").mock(side_effect=fast_document)
+
+    result = AgreementDownloadService(s).download(
+        out_dir=out, from_date="2026-01-01T00:00:00Z", to_date=None, status="completed", page_size=1
+    )
+
+    assert result.status == "ok"
+    assert [e.agreement.envelope.envelope_id for e in result.exported] == ["e0", "e1"]
+
+
+@respx.mock
+def test_service_reserves_inflight_budget_for_unknown_sizes(tmp_path: Path, monkeypatch):
+    s = _settings(tmp_path).model_copy(update={"max_inflight_bytes": 1000, "unknown_document_bytes": 600})
+    _stub_auth(monkeypatch)
+    base = "https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes"
+    respx.get(base).respond(
+        200,
+        json={
+            "envelopes": [
+                {
+                    "envelopeId": "e1",
+                    "status": "completed",
+                    "envelopeDocuments": [
+                        {"documentId": "1", "name": "A"},
+                        {"documentId": "2", "name": "B", "sizeBytes": "100"},
+                        {"documentId": "combined", "name": "C"},
+                    ],
+                }
+            ]
+        },
+    )
+    respx.get(url__regex=rf"{base}/e1/documents/.*").respond(
+        200, headers={"content-type": "application/pdf"}, content=b"%PDF"
+    )
+    svc = AgreementDownloadService(s)
+    reserved: list[int] = []
+    acquire = svc.throttle.inflight.acquire
+    monkeypatch.setattr(svc.throttle.inflight, "acquire", lambda n: reserved.append(acquire(n)) or reserved[-1])
+
+    result = svc.download(out_dir=tmp_path / "out", from_date="2026-01-01T00:00:00Z", to_date=None, status="completed")
+
+    assert result.status == "ok"
+    assert reserved == [600, 100, 1000]
+
+
+class _BrokenBody(httpx.SyncByteStream):
+    def __iter__(self):
+        yield b"%PDF-par"
+        raise httpx.ReadTimeout("body stalled")
+
+
+@respx.mock
+def test_service_retries_document_body_cut_off_mid_transfer(tmp_path: Path, monkeypatch):
+    _stub_auth(monkeypatch)
+    sleeps: list[float] = []
+    monkeypatch.setattr(service_mod.time, "sleep", sleeps.append)
+    base = "https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes"
+    respx.get(base).respond(
+        200,
+        json={"envelopes": [{"envelopeId": "e1", "status": "completed", "envelopeDocuments": [
+            {"documentId": "1", "name": "A"}, {"documentId": "2", "name": "B"},
+        ]}]},
+    )
+    pdf = {"content-type": "application/pdf"}
+    doc1 = respx.get(f"{base}/e1/documents/1").mock(
+        side_effect=[httpx.Response(200, headers=pdf, stream=_BrokenBody()), httpx.Response(200, headers=pdf, content=b"%PDF")]
+    )
+    respx.get(f"{base}/e1/documents/2").mock(side_effect=lambda request: httpx.Response(200, headers=pdf, stream=_BrokenBody()))
+
+    result = AgreementDownloadService(_settings(tmp_path)).download(
+        out_dir=tmp_path / "out", from_date="2026-01-01T00:00:00Z", to_date=None, status="completed"
+    )
+
+    assert doc1.call_count == 2
+    [manifest] = result.exported[0].manifest
+    assert (manifest.document_id, manifest.size) == ("1", 4)
+    assert manifest.path.read_bytes() == b"%PDF"
+    [record] = result.failure_records
+    assert (record.document_id, record.exception_class) == ("2", "httpx.ReadTimeout")
+    assert len(sleeps) == 1 + (service_mod._DOCUMENT_BODY_ATTEMPTS - 1)  # doc 1 once, doc 2 until it gives up
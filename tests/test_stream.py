@@ -0,0 +1,138 @@
+from pathlib import Path
+import asyncio
+import time
+
+import pytest
+import respx
+
+from docusign_agreements_downloader import service as service_mod
+from docusign_agreements_downloader.config import Settings
+from docusign_agreements_downloader.models import OAuthToken
+from docusign_agreements_downloader.service import AgreementDownloadService
+from docusign_agreements_downloader.stream import prefetch
+
+BASE = "https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes"
+
+
+def test_prefetch_bounds_producer():
+    produced = []
+
+    def items():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    it = prefetch(items(), ahead=3)
+    assert next(it) == 0
+    time.sleep(0.1)  # let the producer run ahead as far as it can
+    # one handed out, `ahead` queued, one blocked in put()
+    assert len(produced) <= 1 + 3 + 1
+    it.close()
+    assert len(produced) < 100
+
+
+def test_prefetch_reraises_producer_errors():
+    def items():
+        yield 1
+        raise ValueError("boom")
+
+    it = prefetch(items(), ahead=2)
+    assert next(it) == 1
+    with pytest.raises(ValueError, match="boom"):
+        next(it)
+
+
+def test_prefetch_zero_is_passthrough():
+    assert list(prefetch(iter([1, 2]), ahead=0)) == [1, 2]
+
+
+def _service(tmp_path: Path, monkeypatch) -> AgreementDownloadService:
+    k = tmp_path / "k.pem"
+    k.write_text("unused", encoding="utf-8")
+    monkeypatch.setattr(
+        service_mod, "fetch_access_token", lambda s, h: OAuthToken(access_token="tok", expires_in=3600)
+    )
+    respx.get("https://account-d.docusign.com/oauth/userinfo").respond(
+        200, json={"accounts": [{"account_id": "acc", "base_uri": "https://demo.docusign.net", "is_default": True}]}
+    )
+    respx.get(BASE).respond(
+        200,
+        json={
+            "envelopes": [
+                {"envelopeId": "e1", "status": "completed", "envelopeDocuments": [{"documentId": "1", "name": "A"}]},
+                {"envelopeId": "e2", "status": "completed", "envelopeDocuments": [{"documentId": "1", "name": "B"}]},
+            ]
+        },
+    )
+    respx.get(f"{BASE}/e1/documents/1").respond(200, headers={"content-type": "application/pdf"}, content=b"%PDF-1")
+    respx.get(f"{BASE}/e2/documents/1").respond(200, headers={"content-type": "application/pdf"}, content=b"%PDF-2")
+    return AgreementDownloadService(
+        Settings(
+            auth_server="https://account-d.docusign.com",
+            integration_key="INTEGRATION_KEY_12345",
+            user_id="USER_GUID_12345",
+            private_key_pem_path=k,
+        )
+    )
+
+
+@respx.mock
+def test_iter_agreements_writes_nothing(tmp_path: Path, monkeypatch):
+    svc = _service(tmp_path, monkeypatch)
+    agreements = list(svc.iter_agreements("2026-01-01T00:00:00Z", prefetch_envelopes=1))
+    assert [a.envelope.envelope_id for a in agreements] == ["e1", "e2"]
+    assert agreements[1].documents[0].name == "B"
+    assert list(tmp_path.iterdir()) == [tmp_path / "k.pem"]
+
+
+@respx.mock
+def test_iter_agreements_skips_bad_envelopes(tmp_path: Path, monkeypatch, caplog):
+    svc = _service(tmp_path, monkeypatch)
+    respx.get(BASE).respond(
+        200,
+        json={
+            "envelopes": [
+                {"envelopeId": "e1", "status": "completed"},  # documents lookup fails
+                {"status": "completed"},  # no envelopeId
+                {"envelopeId": "e2", "status": "completed", "envelopeDocuments": [{"documentId": "1", "name": "B"}]},
+            ]
+        },
+    )
+    respx.get(f"{BASE}/e1/documents").respond(404, text="gone")
+
+    with caplog.at_level("WARNING"):
+        agreements = list(svc.iter_agreements("2026-01-01T00:00:00Z", prefetch_envelopes=1))
+    assert [a.envelope.envelope_id for a in agreements] == ["e2"]
+    assert len([r for r in caplog.records if r.message.startswith("skipping envelope")]) == 2
+
+    errors: list[tuple[object, str]] = []
+    agreements = list(
+        svc.iter_agreements(
+            "2026-01-01T00:00:00Z", on_error=lambda row, e: errors.append((row.get("envelopeId"), type(e).__name__))
+        )
+    )
+    assert [a.envelope.envelope_id for a in agreements] == ["e2"]
+    assert errors == [("e1", "ApiError"), (None, "ValueError")]
+
+
+@respx.mock
+def test_iter_documents_streams_bytes(tmp_path: Path, monkeypatch):
+    svc = _service(tmp_path, monkeypatch)
+    got = [
+        (d.agreement.envelope.envelope_id, d.content_type, d.read())
+        for d in svc.iter_documents("2026-01-01T00:00:00Z")
+    ]
+    assert got == [("e1", "application/pdf", b"%PDF-1"), ("e2", "application/pdf", b"%PDF-2")]
+
+
+@respx.mock
+def test_aiter_documents(tmp_path: Path, monkeypatch):
+    svc = _service(tmp_path, monkeypatch)
+
+    async def consume():
+        out = []
+        async for d in svc.aiter_documents("2026-01-01T00:00:00Z", prefetch_envelopes=1):
+            out.append(b"".join([c async for c in d.aiter_bytes()]))
+        return out
+
+    assert asyncio.run(consume()) == [b"%PDF-1", b"%PDF-2"]
@@ -0,0 +1,82 @@
+import threading
+
+from docusign_agreements_downloader.models import DocumentInfo
+from docusign_agreements_downloader.throttle import ByteBudget, LaneScheduler, Throttle, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, s: float) -> None:
+        self.sleeps.append(s)
+        self.now += s
+
+
+def test_token_bucket_paces_to_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=100, burst=100, clock=clock, sleep=clock.sleep)
+    bucket.consume(100)  # burst
+    assert clock.sleeps == []
+    bucket.consume(50)
+    assert clock.sleeps == [0.5]
+    bucket.consume(250)  # larger than the bucket: allowed, but pays the debt
+    assert clock.sleeps[-1] == 2.5
+
+
+def test_token_bucket_unlimited():
+    clock = FakeClock()
+    TokenBucket(rate=None, clock=clock, sleep=clock.sleep).consume(10**12)
+    assert clock.sleeps == []
+
+
+def test_byte_budget_blocks_until_released():
+    budget = ByteBudget(100)
+    held = budget.acquire(80)
+    assert held == 80
+    acquired = threading.Event()
+
+    def second():
+        budget.acquire(50)
+        acquired.set()
+
+    t = threading.Thread(target=second)
+    t.start()
+    assert not acquired.wait(0.05)
+    budget.release(held)
+    assert acquired.wait(1)
+    t.join()
+    budget.release(50)
+    assert budget.acquire(10**9) == 100  # clamped to what the budget can ever hold
+
+
+def test_throttle_disabled_by_default():
+    t = Throttle()
+    t.network(10**9)
+    t.disk(10**9)
+    assert t.inflight.acquire(10**9) == 0
+
+
+def test_lane_scheduler_keeps_small_documents_moving():
+    lanes = LaneScheduler(workers=2, large_bytes=1000, large_slots=1)
+    release_large = threading.Event()
+    try:
+        large = [lanes.submit(5000, release_large.wait, 5) for _ in range(2)]
+        small = [lanes.submit(10, lambda i=i: i) for i in range(5)]
+        assert [f.result(timeout=1) for f in small] == [0, 1, 2, 3, 4]
+        assert not large[0].done()
+    finally:
+        release_large.set()
+        lanes.shutdown()
+    assert lanes.is_large(1000) and not lanes.is_large(None)
+
+
+def test_document_estimated_size():
+    assert DocumentInfo(document_id="1", name="a", raw={"sizeBytes": "2048"}).estimated_size == 2048
+    assert DocumentInfo(document_id="1", name="a", raw={"pages": "3"}).estimated_size == 3 * 100 * 1024
+    assert DocumentInfo(document_id="1", name="a", raw={"pages": [{}, {}]}).estimated_size == 2 * 100 * 1024
+    assert DocumentInfo(document_id="1", name="a").estimated_size is None
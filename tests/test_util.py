@@ -6,3 +6,17 @@ def test_guess_extension():
     assert guess_extension("application/pdf; charset=binary") == "pdf"
     assert guess_extension(None) == "bin"
     assert guess_extension("application/unknown") == "bin"
+
+
+def test_hash_file(tmp_path):
+    import hashlib
+
+    from docusign_agreements_downloader.util import hash_file
+
+    p = tmp_path / "f.bin"
+    data = b"x" * 1000 + b"y"
+    p.write_bytes(data)
+    assert hash_file(p, chunk_size=64) == hashlib.sha256(data).hexdigest()
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert hash_file(empty) == hashlib.sha256(b"").hexdigest()
@@ -0,0 +1,161 @@
+from pathlib import Path
+import hashlib
+import json
+
+import respx
+
+from docusign_agreements_downloader import service as service_mod
+from docusign_agreements_downloader.config import Settings
+from docusign_agreements_downloader.exporter import FilesystemExporter
+from docusign_agreements_downloader.models import (
+    Agreement,
+    DocumentInfo,
+    EnvelopeSummary,
+    ExportedAgreement,
+    FileManifest,
+    OAuthToken,
+)
+from docusign_agreements_downloader.service import AgreementDownloadService
+from docusign_agreements_downloader.verify import ExportVerifier, repair
+
+
+def _export(out: Path) -> FilesystemExporter:
+    """Two documents for env1, one of them written correctly."""
+    exporter = FilesystemExporter(out)
+    agreement_dir, docs_dir, agreement_json = exporter.prepare_agreement_dirs("env1")
+    agreement = Agreement(
+        envelope=EnvelopeSummary(envelope_id="env1", status="completed"),
+        documents=[DocumentInfo(document_id="1", name="A"), DocumentInfo(document_id="2", name="B")],
+    )
+    exporter.write_agreement_json(agreement, agreement_json)
+    manifest = []
+    for doc_id, data in (("1", b"%PDF-one"), ("2", b"%PDF-two")):
+        p = docs_dir / f"{doc_id}_x.pdf"
+        p.write_bytes(data)
+        manifest.append(FileManifest(document_id=doc_id, path=p, size=len(data), sha256=hashlib.sha256(data).hexdigest()))
+    exporter.write_manifest(agreement_dir, manifest)
+    exporter.write_index(
+        [
+            ExportedAgreement(
+                agreement=agreement,
+                agreement_dir=agreement_dir,
+                agreement_json_path=agreement_json,
+                documents_dir=docs_dir,
+                manifest=manifest,
+            )
+        ]
+    )
+    return exporter
+
+
+def test_verify_clean_export(tmp_path: Path):
+    _export(tmp_path)
+    report = ExportVerifier(tmp_path).verify()
+    assert report.ok
+    assert report.agreements_checked == 1
+    assert report.files_checked == 2
+
+
+def test_verify_detects_truncation_and_corruption(tmp_path: Path):
+    _export(tmp_path)
+    (tmp_path / "env1" / "documents" / "1_x.pdf").write_bytes(b"%PDF")
+    (tmp_path / "env1" / "documents" / "2_x.pdf").write_bytes(b"%PDF-TWO")
+
+    report = ExportVerifier(tmp_path).verify()
+    assert [(i.document_id, i.kind) for i in report.issues] == [("1", "size_mismatch"), ("2", "hash_mismatch")]
+
+    sizes_only = ExportVerifier(tmp_path, check_hashes=False).verify()
+    assert [i.kind for i in sizes_only.issues] == ["size_mismatch"]
+
+
+def test_verify_flags_invalid_agreement_json(tmp_path: Path):
+    _export(tmp_path)
+    (tmp_path / "env1" / "agreement.json").write_text("{", encoding="utf-8")
+    report = ExportVerifier(tmp_path).verify()
+    assert [i.kind for i in report.issues] == ["invalid_agreement_json"]
+
+
+def test_verify_scans_tree_without_index(tmp_path: Path):
+    """A run killed mid-way leaves agreement dirs but no index.json."""
+    _export(tmp_path)
+    (tmp_path / "index.json").unlink()
+    exporter = FilesystemExporter(tmp_path)
+    agreement_dir, docs_dir, agreement_json = exporter.prepare_agreement_dirs("env2")
+    exporter.write_agreement_json(
+        Agreement(
+            envelope=EnvelopeSummary(envelope_id="env2", status="completed"),
+            documents=[DocumentInfo(document_id="1", name="A")],
+        ),
+        agreement_json,
+    )
+    exporter.write_manifest(agreement_dir, [])
+    (docs_dir / "1_A.pdf").write_bytes(b"%PD")  # truncated, never recorded
+    (tmp_path / "columnar").mkdir()  # not an agreement directory
+
+    report = ExportVerifier(tmp_path).verify()
+    assert not report.ok
+    assert report.agreements_checked == 2
+    assert [(i.envelope_id, i.document_id, i.kind) for i in report.issues] == [("env2", "1", "missing_document")]
+
+
+def test_verify_flags_envelope_that_failed_before_agreement_json(tmp_path: Path):
+    exporter = _export(tmp_path)
+    exporter.prepare_agreement_dirs("env2")  # listing its documents then failed
+    exporter.prepare_agreement_dirs("env3")
+    rows = exporter.read_index() + [
+        {"envelope_id": "env2", "agreement_json": str(tmp_path / "env2" / "agreement.json"), "failures": ["503"]}
+    ]
+    (tmp_path / "index.json").write_text(json.dumps(rows), encoding="utf-8")
+
+    report = ExportVerifier(tmp_path).verify()
+    assert report.agreements_checked == 3
+    assert [(i.envelope_id, i.kind) for i in report.issues] == [
+        ("env2", "recorded_failure"),
+        ("env3", "invalid_agreement_json"),
+    ]
+
+
+def test_verify_reports_truncated_manifest(tmp_path: Path):
+    _export(tmp_path)
+    manifest = tmp_path / "env1" / "manifest.json"
+    manifest.write_text(manifest.read_text(encoding="utf-8")[:40], encoding="utf-8")  # killed mid-write
+
+    report = ExportVerifier(tmp_path).verify()
+    assert [(i.envelope_id, i.document_id, i.kind) for i in report.issues] == [("env1", None, "invalid_manifest")]
+    assert not (tmp_path / "env1" / "manifest.json.tmp").exists()
+
+
+@respx.mock
+def test_repair_refetches_only_bad_documents(tmp_path: Path, monkeypatch):
+    out = tmp_path / "out"
+    _export(out)
+    (out / "env1" / "documents" / "2_x.pdf").unlink()
+
+    k = tmp_path / "k.pem"
+    k.write_text("unused", encoding="utf-8")
+    settings = Settings(
+        auth_server="https://account-d.docusign.com",
+        integration_key="INTEGRATION_KEY_12345",
+        user_id="USER_GUID_12345",
+        private_key_pem_path=k,
+    )
+    monkeypatch.setattr(
+        service_mod, "fetch_access_token", lambda s, h: OAuthToken(access_token="tok", expires_in=3600)
+    )
+    respx.get("https://account-d.docusign.com/oauth/userinfo").respond(
+        200, json={"accounts": [{"account_id": "acc", "base_uri": "https://demo.docusign.net", "is_default": True}]}
+    )
+    respx.get("https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes").respond(
+        200, json={"envelopes": [{"envelopeId": "env1", "status": "completed"}]}
+    )
+    doc1 = respx.get("https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes/env1/documents/1")
+    doc2 = respx.get("https://demo.docusign.net/restapi/v2.1/accounts/acc/envelopes/env1/documents/2").respond(
+        200, headers={"content-type": "application/pdf"}, content=b"%PDF-two"
+    )
+
+    report = ExportVerifier(out).verify()
+    repaired = repair(AgreementDownloadService(settings), report)
+
+    assert len(repaired) == 1 and not repaired[0].failures
+    assert doc2.called and not doc1.called
+    assert ExportVerifier(out).verify().ok